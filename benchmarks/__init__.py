@@ -0,0 +1 @@
+"""Performance benchmarks for the Jungle model and CLI rendering hot paths."""
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from src.model.game_state import GameState
+from src.model.position import Position
+from src.model.record_trie import RecordTrieBuilder
+from src.model.serialization import export_record
+
+
+@dataclass
+class CompressionReport:
+    games: int
+    moves: int
+    record_bytes: int
+    trie_bytes: int
+    trie_nodes: int
+
+    @property
+    def ratio(self) -> float:
+        return self.record_bytes / self.trie_bytes if self.trie_bytes else 0.0
+
+    def describe(self) -> str:
+        return (f"{self.games} games, {self.moves} moves, {self.trie_nodes} trie nodes\n"
+                f".record files  {self.record_bytes:>12,} bytes\n"
+                f"move trie      {self.trie_bytes:>12,} bytes\n"
+                f"ratio          {self.ratio:>12.1f}x")
+
+
+def sample_corpus(games: int = 500, openings: int = 8, opening_plies: int = 16,
+                  max_plies: int = 80, seed: int = 7) -> List[GameState]:
+    """Random games that branch off a handful of shared opening lines."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(openings):
+        state = GameState.new("Blue", "Red")
+        _play_random(state, rng, opening_plies)
+        lines.append([(m.source, m.target) for m in state.move_log])
+
+    corpus = []
+    for index in range(games):
+        state = GameState.new(f"Blue{index % 5}", f"Red{index % 7}")
+        for source, target in lines[index % openings]:
+            state.move(Position.from_notation(source), Position.from_notation(target))
+        _play_random(state, rng, max_plies - len(state.move_log))
+        corpus.append(state)
+    return corpus
+
+
+def _play_random(state: GameState, rng: random.Random, plies: int) -> None:
+    for _ in range(plies):
+        moves = state.legal_moves()
+        if not moves:
+            return
+        state.move(*rng.choice(moves))
+
+
+def measure(corpus: Sequence[GameState]) -> CompressionReport:
+    builder = RecordTrieBuilder()
+    with tempfile.TemporaryDirectory() as tmp:
+        record_bytes = 0
+        for index, state in enumerate(corpus):
+            path = Path(tmp) / f"game{index:06d}.record"
+            export_record(state, path)
+            record_bytes += path.stat().st_size
+            builder.add_state(state)
+        trie_bytes = builder.save(Path(tmp) / "corpus.trie")
+    return CompressionReport(
+        games=len(corpus),
+        moves=sum(len(state.move_log) for state in corpus),
+        record_bytes=record_bytes,
+        trie_bytes=trie_bytes,
+        trie_nodes=builder.node_count,
+    )
+
+
+def measure_records(paths: Sequence[Path]) -> CompressionReport:
+    builder = RecordTrieBuilder()
+    builder.import_records(paths)
+    with tempfile.TemporaryDirectory() as tmp:
+        trie_bytes = builder.save(Path(tmp) / "corpus.trie")
+    return CompressionReport(
+        games=len(builder),
+        moves=builder.move_count,
+        record_bytes=sum(path.stat().st_size for path in paths),
+        trie_bytes=trie_bytes,
+        trie_nodes=builder.node_count,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compression",
+        description="Compare the size of a move trie with the equivalent .record files.")
+    parser.add_argument("records", nargs="*", type=Path,
+                        help="directories of .record files (default: a generated sample corpus)")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--openings", type=int, default=8,
+                        help="distinct opening lines the sample games share")
+    parser.add_argument("--opening-plies", type=int, default=16)
+    parser.add_argument("--max-plies", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.records:
+        paths = sorted(path for root in args.records for path in root.rglob("*.record"))
+        print(measure_records(paths).describe())
+        return 0
+    corpus = sample_corpus(args.games, args.openings, args.opening_plies,
+                           args.max_plies, args.seed)
+    print(measure(corpus).describe())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.cli.renderers import render_board, render_status
+from src.model.board import Board, InvalidMoveError
+from src.model.enums import PieceType, PlayerSide
+from src.model.game_state import GameState
+from src.model.piece import Piece
+from src.model.position import BOARD_HEIGHT, BOARD_WIDTH, Position
+from src.model.serialization import load_game, save_game
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+MEMORY_SLACK_BYTES = 1024
+
+Workload = Callable[[], object]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops_per_sec: float
+    mean_us: float
+    iterations: int
+    peak_bytes: int
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    def describe(self) -> str:
+        return f"{self.name}: {self.metric} {self.baseline:,.1f} -> {self.current:,.1f}"
+
+
+# Fixtures -----------------------------------------------------------------
+
+
+def scripted_moves(plies: int = 60, seed: int = 3211) -> List[Tuple[Position, Position]]:
+    """Return a deterministic sequence of legal moves from the initial position."""
+    rng = random.Random(seed)
+    state = GameState.new("Blue", "Red")
+    moves: List[Tuple[Position, Position]] = []
+    while len(moves) < plies and not state.winner:
+        candidates = [
+            (piece.position, Position(row, col))
+            for piece in state.board.iter_pieces()
+            if piece.owner is state.current_player
+            for row in range(BOARD_HEIGHT)
+            for col in range(BOARD_WIDTH)
+        ]
+        rng.shuffle(candidates)
+        for src, dst in candidates:
+            if not state.board.is_legal(state.current_player, src, dst):
+                continue
+            state.move(src, dst)
+            moves.append((src, dst))
+            break
+        else:
+            break
+    return moves
+
+
+def _replay(moves: List[Tuple[Position, Position]]) -> GameState:
+    state = GameState.new("Blue", "Red")
+    for src, dst in moves:
+        state.move(src, dst)
+    return state
+
+
+def build_workloads(workdir: Path) -> Dict[str, Workload]:
+    moves = scripted_moves()
+    midgame = _replay(moves)
+    payload = midgame.to_dict()
+    save_path = workdir / "bench.jungle"
+    save_game(midgame, save_path)
+
+    shuttle = Board()
+    shuttle._place_piece(Piece(PieceType.DOG, PlayerSide.BLUE, Position(1, 1)))
+    a, b = Position(1, 1), Position(1, 2)
+
+    def board_move_legal() -> None:
+        shuttle.move(PlayerSide.BLUE, a, b)
+        shuttle.move(PlayerSide.BLUE, b, a)
+
+    initial = Board.initial()
+    lion, river = Position(0, 0), Position(3, 1)
+
+    def board_move_illegal() -> None:
+        try:
+            initial.move(PlayerSide.BLUE, lion, river)
+        except InvalidMoveError:
+            pass
+
+    def board_check_move_illegal() -> None:
+        initial.check_move(PlayerSide.BLUE, lion, river)
+
+    undo_state = GameState.new("Blue", "Red")
+    undo_state.undo_remaining = {PlayerSide.BLUE: sys.maxsize,
+                                 PlayerSide.RED: sys.maxsize}
+    rat, step = Position(2, 0), Position(2, 1)
+
+    def state_move_undo() -> None:
+        undo_state.move(rat, step)
+        undo_state.undo(PlayerSide.BLUE)
+
+    return {
+        "board.move.legal": board_move_legal,
+        "board.move.illegal": board_move_illegal,
+        "board.check_move.illegal": board_check_move_illegal,
+        "board.legal_moves": lambda: midgame.board.legal_moves(midgame.current_player),
+        "board.copy": midgame.board.copy,
+        "game_state.move_undo": state_move_undo,
+        "game_state.to_dict": midgame.to_dict,
+        "game_state.from_dict": lambda: GameState.from_dict(payload),
+        "serialization.save_game": lambda: save_game(midgame, save_path),
+        "serialization.load_game": lambda: load_game(save_path),
+        "renderers.render_board": lambda: render_board(midgame.board),
+        "renderers.render_status": lambda: render_status(midgame.board),
+        "replay.full_game": lambda: _replay(moves),
+    }
+
+
+# Measurement --------------------------------------------------------------
+
+
+def measure(name: str, workload: Workload, repeat: int, min_time: float) -> BenchmarkResult:
+    timer = timeit.Timer(workload)
+    iterations = 1
+    while True:
+        elapsed = timer.timeit(iterations)
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=iterations))
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        workload()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    per_op = best / iterations
+    return BenchmarkResult(
+        name=name,
+        ops_per_sec=1.0 / per_op,
+        mean_us=per_op * 1e6,
+        iterations=iterations,
+        peak_bytes=peak,
+    )
+
+
+def run_benchmarks(selected: Optional[List[str]] = None, repeat: int = 7, min_time: float = 0.2) -> List[BenchmarkResult]:
+    with tempfile.TemporaryDirectory() as tmp:
+        workloads = build_workloads(Path(tmp))
+        names = [name for name in workloads if not selected or any(
+            token in name for token in selected)]
+        return [measure(name, workloads[name], repeat, min_time) for name in names]
+
+
+def compare(results: List[BenchmarkResult], baseline: dict, tolerance: float) -> List[Regression]:
+    regressions: List[Regression] = []
+    reference = {entry["name"]: entry for entry in baseline.get("results", [])}
+    for result in results:
+        entry = reference.get(result.name)
+        if not entry:
+            continue
+        if result.ops_per_sec < entry["ops_per_sec"] * (1 - tolerance):
+            regressions.append(Regression(
+                result.name, "ops/sec", entry["ops_per_sec"], result.ops_per_sec))
+        memory_limit = entry["peak_bytes"] * (1 + tolerance) + MEMORY_SLACK_BYTES
+        if result.peak_bytes > memory_limit:
+            regressions.append(Regression(
+                result.name, "peak bytes", entry["peak_bytes"], result.peak_bytes))
+    return regressions
+
+
+def results_payload(results: List[BenchmarkResult]) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+# Command line -------------------------------------------------------------
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Time Jungle hot paths and compare against a stored baseline.")
+    parser.add_argument("names", nargs="*",
+                        help="only run benchmarks whose name contains one of these substrings")
+    parser.add_argument("--output", type=Path,
+                        help="write machine-readable JSON results here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed fractional slowdown before failing (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="overwrite the baseline with this run instead of comparing")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per timing sample")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, repeat=max(1, args.repeat), min_time=args.min_time)
+    for result in results:
+        print(f"{result.name:<28} {result.ops_per_sec:>14,.0f} ops/s "
+              f"{result.mean_us:>10.2f} us/op {result.peak_bytes / 1024:>9.1f} KiB peak")
+
+    payload = results_payload(results)
+    if args.output:
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Baseline written to {args.baseline}.")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; skipping comparison.")
+        return 0
+
+    regressions = compare(results, json.loads(
+        args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%} tolerance:")
+        for regression in regressions:
+            print(f"  {regression.describe()}")
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,9 +4,12 @@ import sys
 from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
+from ..engine.solver import DEFAULT_MAX_NODES, solve
 from ..model.board import InvalidMoveError
-from ..model.enums import PlayerSide
+from ..model.enums import DrawReason, PlayerSide
 from ..model.game_state import GameState
+from ..model.journal import FsyncPolicy, MoveJournal, resume_game
+from ..model.position_cache import PositionCache
 from ..model.serialization import SerializationError, export_record, load_game, load_record, save_game
 from ..model.position import Position
 
@@ -18,7 +21,10 @@ class JungleShell:
     PROMPT = "jungle> "
 
     def __init__(self) -> None:
+        self._cache = PositionCache()
         self.state = GameState.new(random_name(), random_name())
+        self.state.cache = self._cache
+        self._journal: Optional[MoveJournal] = None
         self._commands: Dict[str, Callable[[List[str]], None]] = {
             "help": self._cmd_help,
             "?": self._cmd_help,
@@ -31,6 +37,11 @@ class JungleShell:
             "load-game": self._cmd_load,
             "export-record": self._cmd_export_record,
             "replay-record": self._cmd_replay_record,
+            "journal": self._cmd_journal,
+            "resume": self._cmd_resume,
+            "draw-limits": self._cmd_draw_limits,
+            "solve": self._cmd_solve,
+            "cache": self._cmd_cache,
             "players": self._cmd_players,
             "history": self._cmd_history,
             "quit": self._cmd_quit,
@@ -72,6 +83,10 @@ class JungleShell:
             print(f"File error: {exc}")
         except ValueError as exc:
             print(f"Error: {exc}")
+        if self._journal and self._journal.error:
+            print(f"Warning: journaling stopped, the game is no longer autosaved "
+                  f"({self._journal.error}).")
+            self._journal = None
 
     # Command implementations -------------------------------------------------
 
@@ -90,13 +105,24 @@ class JungleShell:
             "  load-game <file.jungle>   Load a saved game\n"
             "  export-record <file.record> Save the finished game's move record\n"
             "  replay-record <file.record> Replay a recorded game\n"
+            "  journal <file.jungle> [always|batch|never]\n"
+            "                            Autosave every move to a snapshot + journal\n"
+            "  journal off               Stop autosaving\n"
+            "  resume <file.jungle>      Restore a journaled game after a crash\n"
+            "  draw-limits <repetitions|off> <plies|off>\n"
+            "                            Draw on repeated positions / plies without capture\n"
+            "  solve [max-nodes] [max-plies]\n"
+            "                            Search for a forced win of the side to move\n"
+            "  cache [clear|size <KiB>]  Show or manage the position analysis cache\n"
             "  quit                      Exit the program"
         )
 
     def _cmd_new(self, args: List[str]) -> None:
         blue = args[0] if args else random_name()
         red = args[1] if len(args) > 1 else random_name()
+        self._stop_journal()
         self.state = GameState.new(blue, red)
+        self.state.cache = self._cache
         print("New game created.")
         self._cmd_status([])
 
@@ -121,6 +147,8 @@ class JungleShell:
         if self.state.winner:
             print(
                 f"Winner: {self.state.player_names[self.state.winner]} ({self.state.winner.name})")
+        elif self.state.draw_reason:
+            print(f"Draw: {self._describe_draw()}")
         print(render_status(self.state.board))
 
     def _cmd_move(self, args: List[str]) -> None:
@@ -136,6 +164,8 @@ class JungleShell:
         if self.state.winner:
             print(
                 f"Game over! Winner: {self.state.player_names[self.state.winner]} ({self.state.winner.name})")
+        elif self.state.draw_reason:
+            print(f"Game over! Draw: {self._describe_draw()}")
         else:
             self._cmd_status([])
 
@@ -169,7 +199,10 @@ class JungleShell:
         if len(args) != 1:
             raise ValueError("Usage: load-game <file.jungle>")
         path = ensure_extension(args[0], ".jungle")
-        self.state = load_game(path)
+        state = load_game(path)
+        self._stop_journal()
+        self.state = state
+        self.state.cache = self._cache
         print(f"Loaded game from {path}.")
         self._cmd_status([])
 
@@ -206,12 +239,95 @@ class JungleShell:
             print(render_board(replay_state.board))
         print("Replay finished.")
 
+    def _cmd_journal(self, args: List[str]) -> None:
+        if len(args) == 1 and args[0].lower() == "off":
+            if not self._journal:
+                raise ValueError("Journaling is not active.")
+            path = self._journal.snapshot_path
+            self._stop_journal()
+            print(f"Journaling to {path} stopped.")
+            return
+        if len(args) not in (1, 2):
+            raise ValueError(
+                "Usage: journal <file.jungle> [always|batch|never] | journal off")
+        path = ensure_extension(args[0], ".jungle")
+        policy = self._parse_fsync(args[1] if len(args) > 1 else "always")
+        self._stop_journal()
+        self._start_journal(MoveJournal(path, fsync=policy))
+        print(f"Journaling moves to {path} (fsync: {policy.value}).")
+
+    def _cmd_resume(self, args: List[str]) -> None:
+        if len(args) not in (1, 2):
+            raise ValueError("Usage: resume <file.jungle> [always|batch|never]")
+        path = ensure_extension(args[0], ".jungle")
+        policy = self._parse_fsync(args[1] if len(args) > 1 else "always")
+        state, seq = resume_game(path)
+        self._stop_journal()
+        self.state = state
+        self.state.cache = self._cache
+        self._start_journal(MoveJournal(path, fsync=policy, start_seq=seq))
+        print(f"Resumed game from {path}; journaling continues.")
+        self._cmd_status([])
+
+    def _cmd_draw_limits(self, args: List[str]) -> None:
+        if len(args) != 2:
+            raise ValueError("Usage: draw-limits <repetitions|off> <plies|off>")
+        repetitions, plies = (None if arg.lower() == "off" else int(arg) for arg in args)
+        if (repetitions is not None and repetitions < 2) or (plies is not None and plies < 1):
+            raise ValueError("Repetitions must be at least 2 and plies at least 1.")
+        self.state.repetition_limit = repetitions
+        self.state.no_capture_limit = plies
+        print(f"Draw after {repetitions or 'unlimited'} repetitions or "
+              f"{plies or 'unlimited'} plies without a capture.")
+
+    def _describe_draw(self) -> str:
+        if self.state.draw_reason is DrawReason.REPETITION:
+            return f"position repeated {self.state.repetitions()} times"
+        return f"{self.state.plies_since_capture} plies without a capture"
+
+    def _cmd_solve(self, args: List[str]) -> None:
+        if len(args) > 2:
+            raise ValueError("Usage: solve [max-nodes] [max-plies]")
+        max_nodes = int(args[0]) if args else DEFAULT_MAX_NODES
+        max_plies = int(args[1]) if len(args) > 1 else None
+        result = solve(self.state, max_nodes=max_nodes, max_plies=max_plies)
+        print(f"{result.describe()} ({result.nodes} nodes searched)")
+
+    def _cmd_cache(self, args: List[str]) -> None:
+        if args and args[0].lower() == "clear" and len(args) == 1:
+            self._cache.clear()
+            self._cache.reset_stats()
+            print("Position cache cleared.")
+            return
+        if args and args[0].lower() == "size" and len(args) == 2:
+            self._cache.resize(int(args[1]) * 1024)
+        elif args:
+            raise ValueError("Usage: cache [clear | size <KiB>]")
+        print(f"Position cache: {self._cache.stats().describe()}")
+
     def _cmd_quit(self, _: List[str]) -> None:
+        self._stop_journal()
         print("Goodbye!")
         sys.exit(0)
 
     # Helpers -----------------------------------------------------------------
 
+    def _start_journal(self, journal: MoveJournal) -> None:
+        journal.attach(self.state)
+        self._journal = journal
+
+    def _stop_journal(self) -> None:
+        if self._journal:
+            journal, self._journal = self._journal, None
+            journal.detach()
+
+    def _parse_fsync(self, token: str) -> FsyncPolicy:
+        try:
+            return FsyncPolicy(token.strip().lower())
+        except ValueError as exc:
+            raise ValueError(
+                "Fsync policy must be 'always', 'batch' or 'never'.") from exc
+
     def _parse_side(self, token: str) -> PlayerSide:
         token = token.strip().lower()
         if token in {"blue", "b"}:
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..model.board import Board
+from ..model.enums import PieceType, PlayerSide
+from ..model.game_state import victory_after_move
+from ..model.piece import Piece
+from ..model.position import Position
+
+VERIFIED_SUFFIXES = (".jungle", ".record")
+DEFAULT_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True)
+class FileReport:
+    path: str
+    moves: int
+    errors: Tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_json(self) -> str:
+        return json.dumps({"path": self.path, "ok": self.ok, "moves": self.moves,
+                           "errors": list(self.errors)}, separators=(",", ":"))
+
+
+@dataclass
+class VerifySummary:
+    checked: int = 0
+    failed: int = 0
+
+    def add(self, report: FileReport) -> None:
+        self.checked += 1
+        if not report.ok:
+            self.failed += 1
+
+
+@dataclass
+class _Replay:
+    board: Board
+    current_player: PlayerSide
+    winner: Optional[PlayerSide]
+    errors: List[str]
+
+
+def _replay(moves: Sequence[dict]) -> _Replay:
+    """Play ``moves`` from the initial position, stopping at the first bad one.
+
+    Uses a bare ``Board`` rather than ``GameState``: nothing here needs undo
+    history or published snapshots, and skipping them keeps bulk runs cheap.
+    Stored player names are not compared: a move keeps the name its player
+    had when it was played, and players may be renamed afterwards.
+    """
+    board = Board.initial()
+    player = PlayerSide.BLUE
+    winner: Optional[PlayerSide] = None
+    errors: List[str] = []
+    for index, entry in enumerate(moves, start=1):
+        if winner is not None:
+            errors.append(f"move {index}: played after {winner.name} had already won")
+            break
+        try:
+            source = Position.from_notation(entry["source"])
+            target = Position.from_notation(entry["target"])
+        except (KeyError, TypeError, AttributeError, ValueError) as exc:
+            errors.append(f"move {index}: unreadable coordinates ({exc})")
+            break
+        check = board.check_move(player, source, target)
+        if check:
+            errors.append(f"move {index} {entry['source']}-{entry['target']}: "
+                          f"illegal for {player.name} ({check.message})")
+            break
+        moved, captured = board.move(player, source, target)
+        expected = {
+            "piece": f"{moved.owner.name} {moved.piece_type.name}",
+            "capture": f"{captured.owner.name} {captured.piece_type.name}" if captured else None,
+        }
+        for key, value in expected.items():
+            if entry.get(key) != value:
+                errors.append(f"move {index}: stored {key} {entry.get(key)!r}, replay gives {value!r}")
+        winner = victory_after_move(board, moved, captured)
+        player = player.opponent()
+    return _Replay(board, player, winner, errors)
+
+
+def _stored_board(entries: Iterable[dict]) -> Board:
+    board = Board()
+    for entry in entries:
+        board._place_piece(Piece(PieceType(entry["type"]), PlayerSide(entry["owner"]),
+                                 Position(entry["row"], entry["col"])))
+    return board
+
+
+def _board_differences(stored: Board, replayed: Board) -> List[str]:
+    squares = {piece.position for piece in stored.iter_pieces()}
+    squares.update(piece.position for piece in replayed.iter_pieces())
+    return sorted(square.to_notation() for square in squares
+                  if stored.piece_at(square) != replayed.piece_at(square))
+
+
+def verify_game(data: dict) -> Tuple[int, List[str]]:
+    """Check a ``.jungle`` payload against a replay of its own move list."""
+    moves = data.get("moves", [])
+    replay = _replay(moves)
+    if replay.errors:
+        return len(moves), replay.errors
+    errors: List[str] = []
+    differences = _board_differences(_stored_board(data["pieces"]), replay.board)
+    if differences:
+        errors.append("stored board differs from replay at " + ", ".join(differences))
+    current = PlayerSide(data["current_player"])
+    if current is not replay.current_player:
+        errors.append(f"stored side to move {current.name}, replay gives "
+                      f"{replay.current_player.name}")
+    errors.extend(_winner_errors(data.get("winner"), replay.winner))
+    return len(moves), errors
+
+
+def verify_record(data: dict) -> Tuple[int, List[str]]:
+    """Check that a ``.record`` payload replays legally to its stored winner."""
+    moves = data.get("moves", [])
+    replay = _replay(moves)
+    if replay.errors:
+        return len(moves), replay.errors
+    return len(moves), _winner_errors(data.get("winner"), replay.winner)
+
+
+def _winner_errors(stored: Optional[str], replayed: Optional[PlayerSide]) -> List[str]:
+    stored_side = PlayerSide(stored) if stored else None
+    if stored_side is replayed:
+        return []
+    return [f"stored winner {_side_name(stored_side)}, replay gives {_side_name(replayed)}"]
+
+
+def _side_name(side: Optional[PlayerSide]) -> str:
+    return side.name if side else "none"
+
+
+def verify_file(path: Path) -> FileReport:
+    path = Path(path)
+    try:
+        data = json.loads(path.read_bytes())
+        if not isinstance(data, dict):
+            raise TypeError("top level is not an object")
+        check = verify_game if path.suffix.lower() == ".jungle" else verify_record
+        moves, errors = check(data)
+    except OSError as exc:
+        return FileReport(str(path), 0, (f"cannot read file: {exc}",))
+    except json.JSONDecodeError as exc:
+        return FileReport(str(path), 0, (f"invalid JSON: {exc}",))
+    except (KeyError, TypeError, ValueError, AttributeError) as exc:
+        return FileReport(str(path), 0, (f"malformed file: {exc!r}",))
+    return FileReport(str(path), moves, tuple(errors))
+
+
+def _verify_batch(paths: List[str]) -> List[FileReport]:
+    return [verify_file(Path(path)) for path in paths]
+
+
+def iter_files(roots: Iterable[Path]) -> Iterator[Path]:
+    """Yield saved games and records under ``roots`` without listing them all first."""
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            yield root
+            continue
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if name.lower().endswith(VERIFIED_SUFFIXES):
+                    yield Path(directory) / name
+
+
+def _batches(paths: Iterator[Path], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for path in paths:
+        batch.append(str(path))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def verify_paths(
+    roots: Iterable[Path],
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_report: Optional[Callable[[FileReport], None]] = None,
+) -> VerifySummary:
+    """Verify every file under ``roots`` in a process pool.
+
+    Files are sent to workers in batches and only a few batches are in
+    flight at once, so memory stays flat however many files there are.
+    Reports arrive in completion order, not directory order.
+    """
+    summary = VerifySummary()
+    batches = _batches(iter_files(roots), max(1, batch_size))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        in_flight = (workers or os.cpu_count() or 1) * 2
+
+        def submit_more() -> None:
+            while len(pending) < in_flight:
+                batch = next(batches, None)
+                if batch is None:
+                    return
+                pending.add(pool.submit(_verify_batch, batch))
+
+        submit_more()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for report in future.result():
+                    summary.add(report)
+                    if on_report:
+                        on_report(report)
+            submit_more()
+    return summary
+
+
+# Command line --------------------------------------------------------------
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.verify",
+        description="Replay saved games and records and check them against their stored results.")
+    parser.add_argument("paths", nargs="+", type=Path,
+                        help=".jungle/.record files or directories to scan recursively")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="files handed to a worker at a time")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="write one JSON line per file to this path")
+    parser.add_argument("--all", action="store_true",
+                        help="print passing files as well as failures")
+    args = parser.parse_args(argv)
+
+    report_handle = open(args.report, "w", encoding="utf-8") if args.report else None
+
+    def emit(report: FileReport) -> None:
+        if report_handle:
+            report_handle.write(report.to_json() + "\n")
+        if not report.ok:
+            print(f"FAIL {report.path}: {'; '.join(report.errors)}")
+        elif args.all:
+            print(f"ok   {report.path} ({report.moves} moves)")
+
+    try:
+        summary = verify_paths(args.paths, workers=args.workers,
+                               batch_size=args.batch_size, on_report=emit)
+    finally:
+        if report_handle:
+            report_handle.close()
+    print(f"Checked {summary.checked} file(s): {summary.failed} failed.")
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
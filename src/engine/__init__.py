@@ -0,0 +1 @@
+"""Computer players and tooling that pits them against each other."""
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..model.board import Board
+from ..model.enums import PlayerSide
+from ..model.evaluation import Evaluator
+from ..model.game_state import GameState, victory_after_move
+from ..model.position import Position
+from ..model.position_cache import PositionCache
+
+MoveChoice = Tuple[Position, Position]
+
+WIN_SCORE = 1_000_000.0
+PLAYER_KINDS = ("random", "search")
+
+
+@dataclass(frozen=True)
+class PlayerConfig:
+    """Settings for a computer player; parsed from specs like ``search:depth=3``."""
+
+    kind: str = "search"
+    depth: int = 2
+    weights: str = ""
+
+    def __post_init__(self) -> None:
+        if self.kind not in PLAYER_KINDS:
+            raise ValueError(
+                f"Unknown player kind '{self.kind}' (expected one of {', '.join(PLAYER_KINDS)}).")
+        if self.depth < 1:
+            raise ValueError("Search depth must be at least 1.")
+
+    @staticmethod
+    def parse(spec: str) -> "PlayerConfig":
+        kind, _, options = spec.partition(":")
+        config = PlayerConfig(kind=kind.strip() or "search")
+        field_types = {f.name: f.type for f in fields(PlayerConfig)}
+        for option in filter(None, (part.strip() for part in options.split(","))):
+            key, sep, value = option.partition("=")
+            key = key.strip().replace("-", "_")
+            if not sep or key not in field_types or key == "kind":
+                raise ValueError(f"Invalid player option '{option}'.")
+            caster = {"int": int, "float": float}.get(str(field_types[key]), str)
+            config = replace(config, **{key: caster(value.strip())})
+        return config
+
+    @property
+    def label(self) -> str:
+        if self.kind == "random":
+            return "random"
+        label = f"search:depth={self.depth}"
+        return f"{label},weights={self.weights}" if self.weights else label
+
+    def evaluator(self) -> Evaluator:
+        return _load_evaluator(self.weights)
+
+
+def choose_move(state: GameState, config: PlayerConfig, rng: random.Random) -> Optional[MoveChoice]:
+    moves = state.legal_moves()
+    if not moves:
+        return None
+    if config.kind == "random":
+        return rng.choice(moves)
+
+    side = state.current_player
+    board = state.board.copy()
+    board.attach_evaluator(config.evaluator())
+    best_score = -math.inf
+    best: List[MoveChoice] = []
+    for src, dst in moves:
+        # Search with a window just below the best score so equally good moves
+        # are scored exactly and can be picked at random.
+        score = _score_move(board, side, src, dst,
+                            config.depth, best_score - 1e-6, math.inf, state.cache)
+        if score > best_score + 1e-9:
+            best_score, best = score, [(src, dst)]
+        elif score >= best_score - 1e-9:
+            best.append((src, dst))
+    return rng.choice(best)
+
+
+@lru_cache(maxsize=None)
+def _load_evaluator(weights: str) -> Evaluator:
+    return Evaluator.from_file(Path(weights)) if weights else Evaluator()
+
+
+def _score_move(board: Board, side: PlayerSide, src: Position, dst: Position, depth: int, alpha: float, beta: float, cache: Optional[PositionCache]) -> float:
+    child = board.copy()
+    moved, captured = child.move(side, src, dst)
+    if victory_after_move(child, moved, captured) is side:
+        # Prefer quicker wins: more remaining depth means fewer plies played.
+        return WIN_SCORE + depth
+    return -_negamax(child, side.opponent(), depth - 1, -beta, -alpha, cache)
+
+
+def _negamax(board: Board, side: PlayerSide, depth: int, alpha: float, beta: float, cache: Optional[PositionCache]) -> float:
+    if depth == 0:
+        return board.evaluation(side)
+    moves = cache.legal_moves(board, side) if cache else board.legal_moves(side)
+    if not moves:
+        return -WIN_SCORE
+    best = -math.inf
+    for src, dst in moves:
+        score = _score_move(board, side, src, dst, depth, alpha, beta, cache)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+    return best
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..model.board import Board
+from ..model.enums import PlayerSide
+from ..model.game_state import GameState, victory_after_move
+from ..model.position import Position
+from ..model.position_cache import PositionCache
+from ..model.serialization import load_game
+
+INFINITY = 10**12
+DEFAULT_MAX_NODES = 200_000
+DEFAULT_TT_LIMIT = 1_000_000
+
+MoveChoice = Tuple[Position, Position]
+
+
+class SolveStatus(str, Enum):
+    PROVEN = "proven"
+    DISPROVEN = "disproven"
+    UNKNOWN = "unknown"
+
+
+@dataclass
+class ProofNode:
+    """One move of a proof: attacker nodes keep their winning reply only."""
+
+    move: Optional[MoveChoice]
+    children: List["ProofNode"] = field(default_factory=list)
+
+    @property
+    def notation(self) -> str:
+        if self.move is None:
+            return "root"
+        return f"{self.move[0].to_notation()}-{self.move[1].to_notation()}"
+
+
+@dataclass
+class SolveResult:
+    status: SolveStatus
+    attacker: PlayerSide
+    nodes: int
+    max_plies: Optional[int]
+    plies: Optional[int] = None
+    principal_variation: List[MoveChoice] = field(default_factory=list)
+    proof: Optional[ProofNode] = None
+
+    def describe(self) -> str:
+        if self.status is SolveStatus.PROVEN:
+            line = " ".join(f"{src.to_notation()}-{dst.to_notation()}"
+                            for src, dst in self.principal_variation)
+            return f"{self.attacker.name} wins by force in {self.plies} plies: {line}"
+        if self.status is SolveStatus.DISPROVEN:
+            limit = f" within {self.max_plies} plies" if self.max_plies else ""
+            return f"{self.attacker.name} has no forced win{limit}."
+        return f"No result after {self.nodes} nodes."
+
+
+class _Node:
+    __slots__ = ("move", "parent", "to_move", "depth", "key",
+                 "pn", "dn", "children", "length")
+
+    def __init__(self, move: Optional[MoveChoice], parent: Optional["_Node"], to_move: PlayerSide, depth: int, key: int) -> None:
+        self.move = move
+        self.parent = parent
+        self.to_move = to_move
+        self.depth = depth
+        self.key = key
+        self.pn = 1
+        self.dn = 1
+        self.children: Optional[List[_Node]] = None
+        # Plies to the end of the proof (or disproof) once the node is solved.
+        self.length = 0
+
+
+def position_key(board: Board, to_move: PlayerSide) -> int:
+    return board.position_hash(to_move)
+
+
+class ProofNumberSolver:
+    """Proof-number search for a forced win of the side to move.
+
+    Wins are the game's own terminal conditions (den entry or eliminating
+    every enemy piece, see ``victory_after_move``); a side left without
+    legal moves loses.  ``max_plies`` bounds the proof length ("wins in N"),
+    ``max_nodes`` bounds the search tree and ``tt_limit`` the transposition
+    table of solved positions.
+    """
+
+    def __init__(self, max_nodes: int = DEFAULT_MAX_NODES, max_plies: Optional[int] = None, tt_limit: int = DEFAULT_TT_LIMIT, cache: Optional[PositionCache] = None) -> None:
+        self.max_nodes = max_nodes
+        self.max_plies = max_plies
+        self.tt_limit = tt_limit
+        self.cache = cache
+        self._table: Dict[Tuple[int, Optional[int]], Tuple[bool, int]] = {}
+        self._nodes = 0
+
+    def solve(self, state: GameState) -> SolveResult:
+        attacker = state.current_player
+        if state.is_over:
+            status = SolveStatus.PROVEN if state.winner is attacker else SolveStatus.DISPROVEN
+            return SolveResult(status, attacker, 0, self.max_plies,
+                               0 if status is SolveStatus.PROVEN else None)
+
+        self._attacker = attacker
+        self._nodes = 1
+        root_board = state.board
+        root = _Node(None, None, attacker, 0,
+                     position_key(root_board, attacker))
+        while root.pn and root.dn and self._nodes < self.max_nodes:
+            board = root_board.copy()
+            node = root
+            while node.children:
+                node = self._select(node)
+                board.move(node.parent.to_move, *node.move)
+            self._expand(node, board)
+            self._update_ancestors(node)
+
+        if root.pn == 0:
+            return SolveResult(SolveStatus.PROVEN, attacker, self._nodes, self.max_plies,
+                               root.length, self._principal_variation(root), self._proof_tree(root))
+        if root.dn == 0:
+            return SolveResult(SolveStatus.DISPROVEN, attacker, self._nodes, self.max_plies)
+        return SolveResult(SolveStatus.UNKNOWN, attacker, self._nodes, self.max_plies)
+
+    # Tree maintenance -------------------------------------------------------
+
+    def _is_or(self, node: _Node) -> bool:
+        return node.to_move is self._attacker
+
+    def _select(self, node: _Node) -> _Node:
+        assert node.children
+        if self._is_or(node):
+            return min(node.children, key=lambda child: child.pn)
+        return min(node.children, key=lambda child: child.dn)
+
+    def _expand(self, node: _Node, board: Board) -> None:
+        if self.cache is not None:
+            moves = self.cache.legal_moves(board, node.to_move)
+        else:
+            moves = board.legal_moves(node.to_move)
+        node.children = []
+        if not moves:
+            self._set_solved(node, node.to_move is not self._attacker, 0)
+            return
+        for src, dst in moves:
+            child_board = board.copy()
+            moved, captured = child_board.move(node.to_move, src, dst)
+            child = _Node((src, dst), node, node.to_move.opponent(), node.depth + 1,
+                          position_key(child_board, node.to_move.opponent()))
+            self._nodes += 1
+            victor = victory_after_move(child_board, moved, captured)
+            if victor is not None:
+                self._set_solved(child, victor is self._attacker, 0)
+            elif self.max_plies is not None and child.depth >= self.max_plies:
+                self._set_solved(child, False, 0)
+            else:
+                known = self._table.get((child.key, self._remaining(child)))
+                if known is not None:
+                    child.children = []
+                    self._set_solved(child, *known)
+            node.children.append(child)
+        self._recompute(node)
+
+    def _remaining(self, node: _Node) -> Optional[int]:
+        return None if self.max_plies is None else self.max_plies - node.depth
+
+    def _set_solved(self, node: _Node, proven: bool, length: int) -> None:
+        node.pn, node.dn = (0, INFINITY) if proven else (INFINITY, 0)
+        node.length = length
+
+    def _recompute(self, node: _Node) -> None:
+        children = node.children
+        assert children
+        if self._is_or(node):
+            node.pn = min(child.pn for child in children)
+            node.dn = min(INFINITY, sum(child.dn for child in children))
+        else:
+            node.pn = min(INFINITY, sum(child.pn for child in children))
+            node.dn = min(child.dn for child in children)
+        if node.pn == 0 or node.dn == 0:
+            node.length = self._solved_length(node)
+            if len(self._table) < self.tt_limit:
+                self._table[node.key, self._remaining(node)] = (
+                    node.pn == 0, node.length)
+
+    def _solved_length(self, node: _Node) -> int:
+        assert node.children
+        proven = node.pn == 0
+        if self._is_or(node) == proven:
+            # The winning side is to move and takes its shortest line ...
+            return 1 + min(child.length for child in node.children
+                           if (child.pn == 0) == proven)
+        # ... while the losing side resists for as long as possible.
+        return 1 + max(child.length for child in node.children)
+
+    def _update_ancestors(self, node: _Node) -> None:
+        current = node.parent
+        while current is not None:
+            before = (current.pn, current.dn)
+            self._recompute(current)
+            if (current.pn, current.dn) == before:
+                break
+            current = current.parent
+
+    # Results ----------------------------------------------------------------
+
+    def _best_child(self, node: _Node) -> Optional[_Node]:
+        if not node.children:
+            return None
+        proven = [child for child in node.children if child.pn == 0]
+        if self._is_or(node):
+            return min(proven, key=lambda child: child.length) if proven else None
+        return max(node.children, key=lambda child: child.length)
+
+    def _principal_variation(self, root: _Node) -> List[MoveChoice]:
+        line: List[MoveChoice] = []
+        node = self._best_child(root)
+        while node is not None:
+            assert node.move is not None
+            line.append(node.move)
+            node = self._best_child(node)
+        return line
+
+    def _proof_tree(self, node: _Node) -> ProofNode:
+        proof = ProofNode(node.move)
+        if not node.children:
+            return proof
+        if self._is_or(node):
+            best = self._best_child(node)
+            if best is not None:
+                proof.children.append(self._proof_tree(best))
+        else:
+            proof.children = [self._proof_tree(child) for child in node.children]
+        return proof
+
+
+def solve(state: GameState, max_nodes: int = DEFAULT_MAX_NODES, max_plies: Optional[int] = None) -> SolveResult:
+    """Solve ``state``; with ``state.cache`` set, results and move lists are reused."""
+    cache = state.cache
+    solver = ProofNumberSolver(max_nodes=max_nodes, max_plies=max_plies, cache=cache)
+    if cache is None or state.is_over:
+        return solver.solve(state)
+    return cache.analysis(state.board, state.current_player,
+                          ("solve", max_nodes, max_plies), lambda: solver.solve(state),
+                          size=_result_bytes)
+
+
+def _result_bytes(result: SolveResult) -> int:
+    # Rough footprint: the result itself plus one small object per proof move.
+    moves = 0
+    pending = [result.proof] if result.proof else []
+    while pending:
+        node = pending.pop()
+        moves += 1
+        pending.extend(node.children)
+    return 256 + 48 * len(result.principal_variation) + 120 * moves
+
+
+def solve_files(paths: Iterable[Path], max_nodes: int = DEFAULT_MAX_NODES, max_plies: Optional[int] = None) -> List[Tuple[Path, SolveResult]]:
+    """Solve the position stored in each ``.jungle`` file for its side to move."""
+    return [(Path(path), solve(load_game(Path(path)), max_nodes, max_plies))
+            for path in paths]
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Set
+
+from ..model.enums import PlayerSide
+from ..model.game_state import GameState
+from ..model.position_cache import PositionCache
+from ..model.serialization import export_record, load_game
+from .players import PlayerConfig, choose_move
+
+DEFAULT_MAX_PLIES = 200
+# Engines shuffle back and forth in quiet positions; end such games as draws.
+REPETITION_LIMIT = 3
+
+# Pair scores from the candidate's point of view: 0, 0.5, 1, 1.5 or 2 points
+# over the two colour-swapped games, stored as indices 0..4.
+PAIR_OUTCOMES = 5
+SPRT_PRIOR = 0.25
+
+
+@dataclass(frozen=True)
+class GameOutcome:
+    candidate_side: PlayerSide
+    winner: Optional[PlayerSide]
+    plies: int
+    record_path: Optional[str]
+
+    @property
+    def candidate_score(self) -> float:
+        if self.winner is None:
+            return 0.5
+        return 1.0 if self.winner is self.candidate_side else 0.0
+
+
+@dataclass(frozen=True)
+class PairOutcome:
+    pair_index: int
+    opening: Optional[str]
+    games: tuple[GameOutcome, GameOutcome]
+
+    @property
+    def score(self) -> float:
+        return sum(game.candidate_score for game in self.games)
+
+
+@dataclass(frozen=True)
+class SprtSettings:
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def lower_bound(self) -> float:
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper_bound(self) -> float:
+        return math.log((1 - self.beta) / self.alpha)
+
+
+@dataclass
+class TournamentReport:
+    candidate: PlayerConfig
+    baseline: PlayerConfig
+    sprt: SprtSettings
+    pentanomial: List[int] = field(default_factory=lambda: [0] * PAIR_OUTCOMES)
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    llr: float = 0.0
+    verdict: Optional[str] = None
+
+    @property
+    def pairs(self) -> int:
+        return sum(self.pentanomial)
+
+    def add(self, pair: PairOutcome) -> None:
+        self.pentanomial[int(round(pair.score * 2))] += 1
+        for game in pair.games:
+            if game.winner is None:
+                self.draws += 1
+            elif game.winner is game.candidate_side:
+                self.wins += 1
+            else:
+                self.losses += 1
+        self.llr = sprt_llr(self.pentanomial, self.sprt.elo0, self.sprt.elo1)
+        if self.llr >= self.sprt.upper_bound:
+            self.verdict = "H1 accepted: candidate is stronger"
+        elif self.llr <= self.sprt.lower_bound:
+            self.verdict = "H0 accepted: no improvement"
+
+    def elo(self) -> tuple[float, float]:
+        """Elo difference and half-width of its 95% confidence interval."""
+        mean, variance = _pentanomial_stats(self.pentanomial)
+        if self.pairs == 0:
+            return 0.0, math.inf
+        margin = 1.959964 * math.sqrt(variance / self.pairs)
+        elo = score_to_elo(mean)
+        low, high = score_to_elo(mean - margin), score_to_elo(mean + margin)
+        if not (math.isfinite(low) and math.isfinite(high)):
+            return elo, math.inf
+        return elo, (high - low) / 2
+
+    def summary(self) -> str:
+        elo, margin = self.elo()
+        return (
+            f"Candidate: {self.candidate.label}\n"
+            f"Baseline:  {self.baseline.label}\n"
+            f"Games: {self.wins + self.draws + self.losses} "
+            f"(W {self.wins} / D {self.draws} / L {self.losses}), pairs {self.pairs}\n"
+            f"Pentanomial [0, 0.5, 1, 1.5, 2]: {self.pentanomial}\n"
+            f"Elo: {elo:+.1f} +/- {margin:.1f} (95%)\n"
+            f"LLR: {self.llr:.3f} [{self.sprt.lower_bound:.3f}, {self.sprt.upper_bound:.3f}] "
+            f"for elo0={self.sprt.elo0:g}, elo1={self.sprt.elo1:g}\n"
+            f"Result: {self.verdict or 'inconclusive (pair limit reached)'}"
+        )
+
+
+# Statistics ----------------------------------------------------------------
+
+
+def elo_to_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    if score <= 0.0:
+        return -math.inf
+    if score >= 1.0:
+        return math.inf
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def _pentanomial_stats(counts: Sequence[int]) -> tuple[float, float]:
+    total = sum(counts)
+    if total == 0:
+        return 0.5, 0.0
+    scores = [index / (PAIR_OUTCOMES - 1) for index in range(PAIR_OUTCOMES)]
+    mean = sum(s * c for s, c in zip(scores, counts)) / total
+    variance = sum(c * (s - mean) ** 2 for s, c in zip(scores, counts)) / total
+    return mean, variance
+
+
+def sprt_llr(pentanomial: Sequence[int], elo0: float, elo1: float) -> float:
+    """Generalised SPRT log-likelihood ratio for paired games.
+
+    Uses the normal approximation over pair scores, which accounts for the
+    correlation between the two colour-swapped games of a pair.
+    """
+    pairs = sum(pentanomial)
+    if pairs == 0:
+        return 0.0
+    # A small uniform prior keeps the variance meaningful while one outcome
+    # dominates, so the test cannot stop on the first few pairs.
+    counts = [count + SPRT_PRIOR for count in pentanomial]
+    mean, variance = _pentanomial_stats(counts)
+    if variance <= 0:
+        return 0.0
+    s0, s1 = elo_to_score(elo0), elo_to_score(elo1)
+    return pairs * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+
+# Game playing --------------------------------------------------------------
+
+
+def play_game(
+    candidate: PlayerConfig,
+    baseline: PlayerConfig,
+    candidate_side: PlayerSide,
+    opening: Optional[str],
+    seed: int,
+    max_plies: int,
+    record_path: Optional[str],
+) -> GameOutcome:
+    state = load_game(Path(opening)) if opening else GameState.new()
+    state.rename_player(candidate_side, f"candidate {candidate.label}")
+    state.rename_player(candidate_side.opponent(), f"baseline {baseline.label}")
+    state.repetition_limit = REPETITION_LIMIT
+    # Searches revisit the same positions from move to move.
+    state.cache = PositionCache()
+    rng = random.Random(seed)
+    plies = 0
+    winner = state.winner
+    while not state.is_over and plies < max_plies:
+        config = candidate if state.current_player is candidate_side else baseline
+        choice = choose_move(state, config, rng)
+        if choice is None:
+            # A side without legal moves cannot continue; score it as a loss.
+            # Only the outcome says so: the game itself (and its record) has
+            # no winner, which is what a replay of the record gives.
+            winner = state.current_player.opponent()
+            break
+        state.move(*choice)
+        winner = state.winner
+        plies += 1
+
+    if record_path and state.move_log:
+        export_record(state, Path(record_path))
+    return GameOutcome(candidate_side=candidate_side, winner=winner, plies=plies,
+                       record_path=record_path if state.move_log else None)
+
+
+def play_pair(
+    candidate: PlayerConfig,
+    baseline: PlayerConfig,
+    pair_index: int,
+    opening: Optional[str],
+    seed: int,
+    max_plies: int,
+    record_dir: Optional[str],
+) -> PairOutcome:
+    games = []
+    for game_index, side in enumerate((PlayerSide.BLUE, PlayerSide.RED), start=1):
+        record_path = None
+        if record_dir:
+            stem = Path(opening).stem if opening else "initial"
+            record_path = str(
+                Path(record_dir) / f"pair{pair_index:05d}-game{game_index}-{stem}.record")
+        # Both games of a pair share a seed so the colour swap is the only change.
+        games.append(play_game(candidate, baseline, side,
+                     opening, seed, max_plies, record_path))
+    return PairOutcome(pair_index=pair_index, opening=opening, games=(games[0], games[1]))
+
+
+def run_tournament(
+    candidate: PlayerConfig,
+    baseline: PlayerConfig,
+    openings: Sequence[Path] = (),
+    max_pairs: int = 200,
+    workers: Optional[int] = None,
+    record_dir: Optional[Path] = None,
+    sprt: SprtSettings = SprtSettings(),
+    max_plies: int = DEFAULT_MAX_PLIES,
+    seed: int = 0,
+    on_pair: Optional[Callable[[TournamentReport, PairOutcome], None]] = None,
+) -> TournamentReport:
+    report = TournamentReport(candidate=candidate, baseline=baseline, sprt=sprt)
+    if record_dir:
+        Path(record_dir).mkdir(parents=True, exist_ok=True)
+    opening_list: List[Optional[str]] = [str(path) for path in openings] or [None]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = set()
+        submitted = 0
+        in_flight = (workers or os.cpu_count() or 1) * 2
+
+        def submit_next() -> None:
+            nonlocal submitted
+            opening = opening_list[submitted % len(opening_list)]
+            pending.add(pool.submit(play_pair, candidate, baseline, submitted, opening,
+                                    seed * 1_000_003 + submitted, max_plies,
+                                    str(record_dir) if record_dir else None))
+            submitted += 1
+
+        while submitted < max_pairs and len(pending) < in_flight:
+            submit_next()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pair = future.result()
+                if report.verdict is None:
+                    report.add(pair)
+                    if on_pair:
+                        on_pair(report, pair)
+            if report.verdict is not None:
+                for future in pending:
+                    future.cancel()
+                break
+            while submitted < max_pairs and len(pending) < in_flight:
+                submit_next()
+    return report
+
+
+# Command line --------------------------------------------------------------
+
+
+def _collect_openings(paths: Sequence[str]) -> List[Path]:
+    collected: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            collected.extend(sorted(path.glob("*.jungle")))
+        elif path.suffix.lower() == ".jungle":
+            collected.append(path)
+        else:
+            raise ValueError(f"Opening must be a .jungle file or directory: {raw}")
+    return collected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.engine.tournament",
+        description="Play colour-swapped game pairs between two player configurations and stop with an SPRT.")
+    parser.add_argument("--candidate", required=True,
+                        help="player spec, e.g. 'search:depth=3,weights=tuned.json'")
+    parser.add_argument("--baseline", required=True,
+                        help="player spec, e.g. 'search:depth=2' or 'random'")
+    parser.add_argument("--openings", nargs="*", default=[],
+                        help=".jungle files or directories of them (default: initial position)")
+    parser.add_argument("--pairs", type=int, default=200, help="maximum number of game pairs")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--records", type=Path, default=None,
+                        help="directory that receives one .record per game")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES,
+                        help="plies after which a game is scored as a draw")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        candidate = PlayerConfig.parse(args.candidate)
+        baseline = PlayerConfig.parse(args.baseline)
+        openings = _collect_openings(args.openings)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    def progress(report: TournamentReport, _: PairOutcome) -> None:
+        elo, margin = report.elo()
+        print(f"pairs {report.pairs:>5}  W/D/L {report.wins}/{report.draws}/{report.losses}  "
+              f"elo {elo:+7.1f} +/- {margin:5.1f}  llr {report.llr:+.3f}")
+
+    report = run_tournament(
+        candidate, baseline, openings, max_pairs=args.pairs, workers=args.workers,
+        record_dir=args.records, sprt=SprtSettings(args.elo0, args.elo1, args.alpha, args.beta),
+        max_plies=args.max_plies, seed=args.seed, on_pair=progress)
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
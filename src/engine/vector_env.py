@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "src.engine.vector_env needs NumPy; install it with "
+        "`pip install jungle-cli[vector]`.") from exc
+
+from ..model.board import BLUE_DEN, CAPTURE_TABLE, DIRECTIONS, RED_DEN, RIVER_COORDS, Board
+from ..model.enums import PieceType, PlayerSide, SquareType
+from ..model.piece import Piece
+from ..model.position import BOARD_HEIGHT, BOARD_WIDTH, Position, in_bounds
+
+# Boards are stored as rows of 64 int8 cells: squares 0..62 in row-major
+# order plus one padding cell that is always empty, used as the target of
+# out-of-range lookups.  A cell holds the piece's rank, positive for BLUE and
+# negative for RED.  An action is ``square * 4 + direction``; lions and tigers
+# facing the river jump across it, every other piece steps one square.
+SQUARES = BOARD_HEIGHT * BOARD_WIDTH
+PAD = SQUARES
+ACTIONS = SQUARES * len(DIRECTIONS)
+MAX_LANE = 3
+
+BLUE, RED = 1, -1
+NO_WINNER = 0
+
+_TYPE_BY_RANK = {piece_type.definition.rank: piece_type for piece_type in PieceType}
+_SIDES = (PlayerSide.BLUE, PlayerSide.RED)
+
+
+def _side_index(sign: int) -> int:
+    return 0 if sign == BLUE else 1
+
+
+def _square(position: Position) -> int:
+    return position.row * BOARD_WIDTH + position.col
+
+
+def _position(square: int) -> Position:
+    return Position(square // BOARD_WIDTH, square % BOARD_WIDTH)
+
+
+def _build_move_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Destination and jump lane of every (side, rank, square, direction).
+
+    Each geometric candidate is checked with ``Board.is_legal`` on a board
+    holding only the moving piece, so river, den and jump rules come from the
+    board itself.  Rules that depend on other pieces (captures, blocked
+    lanes) are applied per step.
+    """
+    targets = np.full((2, 9, SQUARES + 1, len(DIRECTIONS)), -1, dtype=np.int16)
+    lanes = np.full((2, 9, SQUARES + 1, len(DIRECTIONS), MAX_LANE), PAD, dtype=np.int16)
+    for side_index, side in enumerate(_SIDES):
+        for rank, piece_type in _TYPE_BY_RANK.items():
+            can_jump = piece_type.definition.can_jump
+            for square in range(SQUARES):
+                source = _position(square)
+                probe = Board()
+                probe._place_piece(Piece(piece_type, side, source))
+                for direction, (d_row, d_col) in enumerate(DIRECTIONS):
+                    row, col = source.row + d_row, source.col + d_col
+                    lane: List[int] = []
+                    while can_jump and (row, col) in RIVER_COORDS:
+                        lane.append(row * BOARD_WIDTH + col)
+                        row, col = row + d_row, col + d_col
+                    if not in_bounds(row, col):
+                        continue
+                    if not probe.is_legal(side, source, Position(row, col)):
+                        continue
+                    targets[side_index, rank, square, direction] = row * BOARD_WIDTH + col
+                    lanes[side_index, rank, square, direction, :len(lane)] = lane
+    return targets, lanes
+
+
+def _build_capture_table() -> np.ndarray:
+    """Whether rank a may take rank b, by source and target terrain.
+
+    Indexed ``[attacker, defender, source_is_river, target_class]`` where the
+    target class is 0 for land, 1 for river and 2 for the attacker's own
+    trap.  Filled from the board's ``CAPTURE_TABLE``.
+    """
+    table = np.zeros((9, 9, 2, 3), dtype=bool)
+    for attacker_rank, attacker in _TYPE_BY_RANK.items():
+        for defender_rank, defender in _TYPE_BY_RANK.items():
+            for source_river, source_square in enumerate((SquareType.LAND, SquareType.RIVER)):
+                for target_class, target_square in enumerate(
+                        (SquareType.LAND, SquareType.RIVER, SquareType.TRAP_BLUE)):
+                    code = CAPTURE_TABLE[attacker, defender, PlayerSide.RED,
+                                         source_square, target_square]
+                    table[attacker_rank, defender_rank, source_river, target_class] = not code
+    return table
+
+
+def _build_terrain() -> Tuple[np.ndarray, np.ndarray]:
+    probe = Board()
+    source_river = np.zeros(SQUARES + 1, dtype=np.int8)
+    target_class = np.zeros((2, SQUARES + 1), dtype=np.int8)
+    own_trap = {PlayerSide.BLUE: SquareType.TRAP_BLUE, PlayerSide.RED: SquareType.TRAP_RED}
+    for square in range(SQUARES):
+        kind = probe.square_type(_position(square))
+        if kind is SquareType.RIVER:
+            source_river[square] = 1
+            target_class[:, square] = 1
+        for side_index, side in enumerate(_SIDES):
+            if kind is own_trap[side]:
+                target_class[side_index, square] = 2
+    return source_river, target_class
+
+
+TARGETS, LANES = _build_move_tables()
+CAPTURES = _build_capture_table()
+SOURCE_RIVER, TARGET_CLASS = _build_terrain()
+ENEMY_DEN = np.array([_square(RED_DEN), _square(BLUE_DEN)], dtype=np.int16)
+
+
+def encode_board(board: Board) -> np.ndarray:
+    cells = np.zeros(SQUARES + 1, dtype=np.int8)
+    for piece in board.iter_pieces():
+        rank = piece.piece_type.definition.rank
+        cells[_square(piece.position)] = rank if piece.owner is PlayerSide.BLUE else -rank
+    return cells
+
+
+def decode_board(cells: np.ndarray) -> Board:
+    board = Board()
+    for square in np.flatnonzero(cells[:SQUARES]):
+        value = int(cells[square])
+        owner = PlayerSide.BLUE if value > 0 else PlayerSide.RED
+        board._place_piece(Piece(_TYPE_BY_RANK[abs(value)], owner, _position(int(square))))
+    return board
+
+
+def move_to_action(source: Position, target: Position) -> int:
+    d_row, d_col = source.delta(target)
+    step = (int(np.sign(d_row)), int(np.sign(d_col)))
+    return _square(source) * len(DIRECTIONS) + DIRECTIONS.index(step)
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """Outcome of ``VectorJungleEnv.step`` for every game.
+
+    ``rewards`` are from the point of view of the side that just moved: 1 for
+    a win, 0 otherwise.  ``winners`` holds ``BLUE``, ``RED`` or ``NO_WINNER``
+    (a draw by ``max_plies`` or a game still running).  Finished games have
+    already been reset, so ``observations`` shows their new initial position.
+    """
+
+    observations: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+    winners: np.ndarray
+    captures: np.ndarray
+
+
+class VectorJungleEnv:
+    """``num_games`` Jungle games stepped together with NumPy.
+
+    Follows the same rules as ``Board``; a side left without legal moves
+    loses and a game reaching ``max_plies`` is a draw.
+    """
+
+    def __init__(self, num_games: int, max_plies: int = 200) -> None:
+        if num_games < 1:
+            raise ValueError("num_games must be at least 1.")
+        self.num_games = num_games
+        self.max_plies = max_plies
+        self._initial = encode_board(Board.initial())
+        self._cells = np.empty((num_games, SQUARES + 1), dtype=np.int8)
+        self.to_move = np.empty(num_games, dtype=np.int8)
+        self.plies = np.empty(num_games, dtype=np.int32)
+        self._games = np.arange(num_games)
+        self.reset()
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Boards as an (N, 9, 7) view; updated in place by ``step``."""
+        return self._cells[:, :SQUARES].reshape(self.num_games, BOARD_HEIGHT, BOARD_WIDTH)
+
+    def reset(self, indices: Optional[Iterable[int]] = None) -> np.ndarray:
+        selected = self._games if indices is None else np.asarray(list(indices), dtype=np.intp)
+        self._cells[selected] = self._initial
+        self.to_move[selected] = BLUE
+        self.plies[selected] = 0
+        self._mask = self._legal_mask()
+        return self.observations
+
+    def load(self, index: int, board: Board, to_move: PlayerSide) -> None:
+        self._cells[index] = encode_board(board)
+        self.to_move[index] = BLUE if to_move is PlayerSide.BLUE else RED
+        self.plies[index] = 0
+        self._mask = self._legal_mask()
+
+    def board(self, index: int) -> Board:
+        return decode_board(self._cells[index])
+
+    def legal_action_mask(self) -> np.ndarray:
+        """(N, 252) booleans; True where the action is legal for the side to move."""
+        return self._mask.copy()
+
+    def action_to_move(self, index: int, action: int) -> Tuple[Position, Position]:
+        square, direction = divmod(int(action), len(DIRECTIONS))
+        rank = abs(int(self._cells[index, square]))
+        target = int(TARGETS[_side_index(int(self.to_move[index])), rank, square, direction])
+        if target < 0:
+            raise ValueError(f"Action {action} does not move a piece in game {index}.")
+        return _position(square), _position(target)
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        actions = np.asarray(actions, dtype=np.intp)
+        if actions.shape != (self.num_games,):
+            raise ValueError(f"Expected {self.num_games} actions, got shape {actions.shape}.")
+        if not self._mask[self._games, actions].all():
+            bad = np.flatnonzero(~self._mask[self._games, actions])
+            raise ValueError(f"Illegal action in game(s) {bad[:10].tolist()}.")
+
+        cells, games, side = self._cells, self._games, self.to_move
+        squares, directions = np.divmod(actions, len(DIRECTIONS))
+        pieces = cells[games, squares]
+        side_index = (side == RED).astype(np.intp)
+        targets = TARGETS[side_index, np.abs(pieces), squares, directions]
+        captures = cells[games, targets]
+        cells[games, targets] = pieces
+        cells[games, squares] = 0
+
+        enemy_left = (cells[:, :SQUARES] * side[:, None] < 0).any(axis=1)
+        wins = (targets == ENEMY_DEN[side_index]) | ((captures != 0) & ~enemy_left)
+        self.to_move = side = -side
+        self.plies += 1
+        self._mask = self._legal_mask()
+        # A side that cannot move loses, as in the tournament runner.
+        wins |= ~self._mask.any(axis=1)
+        draws = ~wins & (self.plies >= self.max_plies)
+        dones = wins | draws
+        winners = np.where(wins, -side, NO_WINNER).astype(np.int8)
+        rewards = wins.astype(np.float32)
+
+        if dones.any():
+            self.reset(np.flatnonzero(dones))
+        return StepResult(self.observations, rewards, dones, winners, captures)
+
+    def _legal_mask(self) -> np.ndarray:
+        cells = self._cells
+        count = self.num_games
+        side = self.to_move.astype(np.int8)[:, None]
+        side_index = (self.to_move == RED).astype(np.intp)
+
+        board = cells[:, :SQUARES]
+        ranks = np.abs(board).astype(np.intp)
+        own = board * side > 0
+        ranks = np.where(own, ranks, 0)
+
+        squares = np.arange(SQUARES)
+        targets = TARGETS[side_index[:, None], ranks, squares[None, :]]  # (N, 63, 4)
+        legal = targets >= 0
+        safe_targets = np.where(legal, targets, PAD).astype(np.intp)
+        target_cells = np.take_along_axis(
+            cells, safe_targets.reshape(count, -1), axis=1).reshape(safe_targets.shape)
+        legal &= target_cells * side[:, :, None] <= 0
+
+        lanes = LANES[side_index[:, None], ranks, squares[None, :]].astype(np.intp)  # (N, 63, 4, 3)
+        lane_cells = np.take_along_axis(
+            cells, lanes.reshape(count, -1), axis=1).reshape(lanes.shape)
+        legal &= ~(lane_cells != 0).any(axis=3)
+
+        defenders = np.abs(target_cells).astype(np.intp)
+        attackers = np.broadcast_to(ranks[:, :, None], defenders.shape)
+        source_river = np.broadcast_to(SOURCE_RIVER[None, :SQUARES, None], defenders.shape)
+        target_class = TARGET_CLASS[side_index[:, None, None], safe_targets]
+        allowed = CAPTURES[attackers, defenders, source_river, target_class]
+        legal &= (defenders == 0) | allowed
+        return legal.reshape(count, ACTIONS)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import uuid
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .game_state import GameState
+from .serialization import (
+    GameRecord,
+    SerializationError,
+    load_record,
+    record_from_dict,
+    record_from_state,
+    record_to_dict,
+    write_record,
+)
+
+# Data file layout: a sequence of frames, each a fixed header followed by a
+# compact JSON payload.  The index file holds one fixed-size entry per frame so
+# that opening an archive never has to parse the games themselves.
+ARCHIVE_MAGIC = b"JGA1"
+_FRAME_HEADER = struct.Struct("<4s16sII")  # magic, game id, payload length, crc32
+_INDEX_ENTRY = struct.Struct("<16sQI")  # game id, frame offset, payload length
+
+INDEX_SUFFIX = ".idx"
+
+
+class ArchiveError(SerializationError):
+    pass
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    game_id: str
+    offset: int
+    length: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + _FRAME_HEADER.size + self.length
+
+
+class GameArchive:
+    """Append-only store for many game records in a single file.
+
+    Games are appended to ``path`` and located through ``path + '.idx'``.  A
+    frame left half-written by a crash is detected on open and ignored (and
+    truncated away when the archive is writable).
+    """
+
+    def __init__(self, path: Path, writable: bool = True, sync: bool = True) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.writable = writable
+        self.sync = sync
+        self._entries: List[ArchiveEntry] = []
+        self._by_id: Dict[str, int] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._data_end = 0
+
+        if writable:
+            self.path.touch(exist_ok=True)
+            self.index_path.touch(exist_ok=True)
+        elif not self.path.exists():
+            raise ArchiveError(f"File not found: {self.path}")
+        self._data: BinaryIO = open(self.path, "r+b" if writable else "rb")
+        self._index: Optional[BinaryIO] = open(
+            self.index_path, "r+b") if writable else None
+        self._recover()
+
+    # Context management ------------------------------------------------------
+
+    def __enter__(self) -> "GameArchive":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._data.close()
+        if self._index is not None:
+            self._index.close()
+
+    # Lookup ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._by_id
+
+    def game_ids(self) -> List[str]:
+        return [entry.game_id for entry in self._entries]
+
+    def entry(self, game_id: str) -> ArchiveEntry:
+        try:
+            return self._entries[self._by_id[game_id]]
+        except KeyError as exc:
+            raise ArchiveError(f"Unknown game id: {game_id}") from exc
+
+    def get(self, game_id: str) -> GameRecord:
+        return self._read_entry(self.entry(game_id))
+
+    def record_at(self, index: int) -> GameRecord:
+        return self._read_entry(self._entries[index])
+
+    def __iter__(self) -> Iterator[Tuple[str, GameRecord]]:
+        return self.iter_records()
+
+    def iter_records(self) -> Iterator[Tuple[str, GameRecord]]:
+        # Sequential scan through a private buffered handle: it neither touches
+        # the shared mmap nor loads the whole archive into memory.
+        entries = list(self._entries)
+        with open(self.path, "rb") as handle:
+            for entry in entries:
+                handle.seek(entry.offset)
+                frame = handle.read(_FRAME_HEADER.size + entry.length)
+                yield entry.game_id, self._decode_frame(frame, entry)
+
+    # Appending ---------------------------------------------------------------
+
+    def append(self, record: GameRecord, game_id: Optional[str] = None) -> str:
+        game_id = self._append_frame(record, game_id)
+        self._flush()
+        return game_id
+
+    def append_state(self, state: GameState, game_id: Optional[str] = None) -> str:
+        return self.append(record_from_state(state), game_id)
+
+    def import_records(self, sources: Iterable[Path]) -> List[str]:
+        ids = [self._append_frame(load_record(Path(source)), None)
+               for source in sources]
+        self._flush()
+        return ids
+
+    def export_records(self, directory: Path) -> List[Path]:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+        for game_id, record in self.iter_records():
+            destination = directory / f"{game_id}.record"
+            write_record(record, destination)
+            written.append(destination)
+        return written
+
+    def _append_frame(self, record: GameRecord, game_id: Optional[str]) -> str:
+        if not self.writable or self._index is None:
+            raise ArchiveError("Archive was opened read-only.")
+        game_id = (game_id or uuid.uuid4().hex).lower()
+        raw_id = _encode_id(game_id)
+        if game_id in self._by_id:
+            raise ArchiveError(f"Duplicate game id: {game_id}")
+
+        payload = json.dumps(record_to_dict(record),
+                             separators=(",", ":")).encode("utf-8")
+        header = _FRAME_HEADER.pack(
+            ARCHIVE_MAGIC, raw_id, len(payload), zlib.crc32(payload))
+        entry = ArchiveEntry(game_id=game_id, offset=self._data_end,
+                             length=len(payload))
+
+        # Data first, index second: an index entry never points at bytes that
+        # were not written, and a lost index entry is rebuilt on recovery.
+        self._data.seek(entry.offset)
+        self._data.write(header + payload)
+        self._index.seek(len(self._entries) * _INDEX_ENTRY.size)
+        self._index.write(_INDEX_ENTRY.pack(raw_id, entry.offset, entry.length))
+        self._register(entry)
+        return game_id
+
+    def _flush(self) -> None:
+        assert self._index is not None
+        self._data.flush()
+        if self.sync:
+            os.fsync(self._data.fileno())
+        self._index.flush()
+        if self.sync:
+            os.fsync(self._index.fileno())
+
+    # Internals ---------------------------------------------------------------
+
+    def _register(self, entry: ArchiveEntry) -> None:
+        self._by_id[entry.game_id] = len(self._entries)
+        self._entries.append(entry)
+        self._data_end = entry.end
+
+    def _read_entry(self, entry: ArchiveEntry) -> GameRecord:
+        view = self._view(entry.end)
+        return self._decode_frame(view[entry.offset:entry.end], entry)
+
+    def _view(self, required: int) -> mmap.mmap:
+        if self._mmap is None or len(self._mmap) < required:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._data.flush()
+            self._mmap = mmap.mmap(self._data.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _decode_frame(self, frame: bytes, entry: ArchiveEntry) -> GameRecord:
+        if len(frame) < _FRAME_HEADER.size:
+            raise ArchiveError(f"Truncated archive frame for game {entry.game_id}.")
+        magic, _, length, checksum = _FRAME_HEADER.unpack_from(frame)
+        payload = frame[_FRAME_HEADER.size:_FRAME_HEADER.size + length]
+        if magic != ARCHIVE_MAGIC or len(payload) != length or zlib.crc32(payload) != checksum:
+            raise ArchiveError(f"Corrupted archive frame for game {entry.game_id}.")
+        return record_from_dict(json.loads(payload))
+
+    def _recover(self) -> None:
+        data_size = os.fstat(self._data.fileno()).st_size
+        index_bytes = self.index_path.read_bytes() if self.index_path.exists() else b""
+
+        # Trust index entries only while they describe complete frames laid out
+        # back to back; anything after the first inconsistency is rescanned.
+        for start in range(0, len(index_bytes) - _INDEX_ENTRY.size + 1, _INDEX_ENTRY.size):
+            raw_id, offset, length = _INDEX_ENTRY.unpack_from(index_bytes, start)
+            entry = ArchiveEntry(game_id=raw_id.hex(), offset=offset, length=length)
+            if offset != self._data_end or entry.end > data_size or entry.game_id in self._by_id:
+                break
+            self._register(entry)
+
+        indexed = len(self._entries)
+        while True:
+            entry = self._scan_frame(self._data_end, data_size)
+            if entry is None:
+                break
+            self._register(entry)
+
+        if not self.writable or self._index is None:
+            return
+        if self._data_end < data_size:
+            self._data.truncate(self._data_end)
+        if len(self._entries) != indexed or len(index_bytes) != indexed * _INDEX_ENTRY.size:
+            self._index.seek(0)
+            self._index.truncate()
+            self._index.write(b"".join(
+                _INDEX_ENTRY.pack(bytes.fromhex(entry.game_id),
+                                  entry.offset, entry.length)
+                for entry in self._entries))
+        self._flush()
+
+    def _scan_frame(self, offset: int, data_size: int) -> Optional[ArchiveEntry]:
+        if offset + _FRAME_HEADER.size > data_size:
+            return None
+        self._data.seek(offset)
+        header = self._data.read(_FRAME_HEADER.size)
+        magic, raw_id, length, checksum = _FRAME_HEADER.unpack(header)
+        entry = ArchiveEntry(game_id=raw_id.hex(), offset=offset, length=length)
+        if magic != ARCHIVE_MAGIC or entry.end > data_size or entry.game_id in self._by_id:
+            return None
+        if zlib.crc32(self._data.read(length)) != checksum:
+            return None
+        return entry
+
+
+def _encode_id(game_id: str) -> bytes:
+    try:
+        raw = bytes.fromhex(game_id)
+    except ValueError as exc:
+        raise ArchiveError(
+            f"Game ids must be 32 hexadecimal characters: {game_id}") from exc
+    if len(raw) != 16:
+        raise ArchiveError(
+            f"Game ids must be 32 hexadecimal characters: {game_id}")
+    return raw
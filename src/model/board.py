@@ -1,16 +1,84 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Optional, Tuple
+from enum import IntEnum
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .enums import PieceType, PlayerSide, SquareType
 from .piece import Piece
 from .position import BOARD_HEIGHT, BOARD_WIDTH, Position, in_bounds
 
+if TYPE_CHECKING:
+    from .evaluation import Evaluator
+
+
+class MoveCheck(IntEnum):
+    """Outcome of validating a move; ``OK`` or the first rule it breaks."""
+
+    OK = 0
+    OUT_OF_BOUNDS = 1
+    SAME_SQUARE = 2
+    NO_PIECE = 3
+    NOT_OWN_PIECE = 4
+    TARGET_OCCUPIED_BY_OWN = 5
+    OWN_DEN = 6
+    RIVER_FORBIDDEN = 7
+    ILLEGAL_MOVEMENT = 8
+    JUMP_NOT_STRAIGHT = 9
+    JUMP_OUT_OF_BOUNDS = 10
+    JUMP_OVER_LAND = 11
+    JUMP_BLOCKED_BY_RAT = 12
+    JUMP_WITHOUT_RIVER = 13
+    JUMP_INTO_RIVER = 14
+    CAPTURE_OWN_PIECE = 15
+    ELEPHANT_CAPTURES_RAT = 16
+    RANK_TOO_LOW = 17
+    RAT_ATTACKS_ELEPHANT_FROM_RIVER = 18
+    RAT_CAPTURES_FROM_WATER = 19
+    RAT_ATTACKS_RAT_IN_WATER = 20
+
+    @property
+    def message(self) -> str:
+        return MOVE_CHECK_MESSAGES[self]
+
+
+MOVE_CHECK_MESSAGES: dict[MoveCheck, str] = {
+    MoveCheck.OK: "Move is legal.",
+    MoveCheck.OUT_OF_BOUNDS: "Move must remain inside the board.",
+    MoveCheck.SAME_SQUARE: "Source and target squares differ.",
+    MoveCheck.NO_PIECE: "No piece on the source square.",
+    MoveCheck.NOT_OWN_PIECE: "You can only move your own pieces.",
+    MoveCheck.TARGET_OCCUPIED_BY_OWN: "Target square already filled by your piece.",
+    MoveCheck.OWN_DEN: "You may not enter your own den.",
+    MoveCheck.RIVER_FORBIDDEN: "Only rats may enter the river.",
+    MoveCheck.ILLEGAL_MOVEMENT: "Illegal movement. Pieces move one square orthogonally, lions/tigers may jump rivers.",
+    MoveCheck.JUMP_NOT_STRAIGHT: "Jumping must be horizontal or vertical.",
+    MoveCheck.JUMP_OUT_OF_BOUNDS: "Jump exceeds board boundaries.",
+    MoveCheck.JUMP_OVER_LAND: "Lions and tigers may only jump over rivers.",
+    MoveCheck.JUMP_BLOCKED_BY_RAT: "Cannot jump because a rat blocks the river path.",
+    MoveCheck.JUMP_WITHOUT_RIVER: "Jump must cross at least one river square.",
+    MoveCheck.JUMP_INTO_RIVER: "Jump lands on land immediately beyond the river.",
+    MoveCheck.CAPTURE_OWN_PIECE: "Cannot capture your own piece.",
+    MoveCheck.ELEPHANT_CAPTURES_RAT: "Elephants cannot capture rats.",
+    MoveCheck.RANK_TOO_LOW: "Attacker rank too low to capture target.",
+    MoveCheck.RAT_ATTACKS_ELEPHANT_FROM_RIVER: "Rats cannot attack elephants from river squares.",
+    MoveCheck.RAT_CAPTURES_FROM_WATER: "A rat cannot capture an elephant or rat on land directly from water.",
+    MoveCheck.RAT_ATTACKS_RAT_IN_WATER: "A rat on land cannot attack a rat in the water.",
+}
+
 
 class InvalidMoveError(RuntimeError):
     """Raised when a move violates Jungle rules."""
 
+    def __init__(self, message: str, code: Optional[MoveCheck] = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+    @staticmethod
+    def from_check(code: MoveCheck) -> "InvalidMoveError":
+        return InvalidMoveError(code.message, code)
+
 
 PositionKey = Tuple[int, int]
 
@@ -19,6 +87,8 @@ def _pos_key(position: Position) -> PositionKey:
     return position.row, position.col
 
 
+DIRECTIONS: tuple[PositionKey, ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
 BLUE_TRAPS = {Position(0, 2), Position(0, 4), Position(1, 3)}
 RED_TRAPS = {Position(8, 2), Position(8, 4), Position(7, 3)}
 BLUE_DEN = Position(0, 3)
@@ -28,6 +98,26 @@ RIVER_COORDS = {
     for row in (3, 4, 5)
     for col in (1, 2, 4, 5)
 }
+# One bit per river square, used to track which jump lanes are blocked.
+RIVER_BITS: Dict[PositionKey, int] = {
+    key: 1 << index for index, key in enumerate(sorted(RIVER_COORDS))}
+
+# Zobrist hashing: one random 64-bit key per piece on each square. A
+# position's hash is the XOR of the keys of its pieces, so a move updates it
+# with two or three XORs instead of a rescan of the board.
+_ZOBRIST_RNG = random.Random(0x4A554E47)
+ZOBRIST_KEYS: Dict[Tuple[PieceType, PlayerSide, int, int], int] = {
+    (piece_type, owner, row, col): _ZOBRIST_RNG.getrandbits(64)
+    for piece_type in PieceType
+    for owner in PlayerSide
+    for row in range(BOARD_HEIGHT)
+    for col in range(BOARD_WIDTH)
+}
+ZOBRIST_RED_TO_MOVE = _ZOBRIST_RNG.getrandbits(64)
+
+
+def _zobrist(piece: Piece) -> int:
+    return ZOBRIST_KEYS[piece.piece_type, piece.owner, piece.position.row, piece.position.col]
 
 
 INITIAL_BLUE_POSITIONS: dict[PieceType, Position] = {
@@ -42,6 +132,76 @@ INITIAL_BLUE_POSITIONS: dict[PieceType, Position] = {
 }
 
 
+def _square_type(row: int, col: int) -> SquareType:
+    position = Position(row, col)
+    if (row, col) in RIVER_COORDS:
+        return SquareType.RIVER
+    if position == BLUE_DEN:
+        return SquareType.DEN_BLUE
+    if position == RED_DEN:
+        return SquareType.DEN_RED
+    if position in BLUE_TRAPS:
+        return SquareType.TRAP_BLUE
+    if position in RED_TRAPS:
+        return SquareType.TRAP_RED
+    return SquareType.LAND
+
+
+SQUARE_TYPES: Dict[PositionKey, SquareType] = {
+    (row, col): _square_type(row, col)
+    for row in range(BOARD_HEIGHT)
+    for col in range(BOARD_WIDTH)
+}
+
+
+def _capture_rule(
+    attacker: PieceType,
+    defender: PieceType,
+    defender_owner: PlayerSide,
+    source_square: SquareType,
+    target_square: SquareType,
+) -> MoveCheck:
+    """Whether ``attacker`` may take an enemy ``defender``; compiled into ``CAPTURE_TABLE``."""
+    if attacker is PieceType.RAT:
+        if source_square == SquareType.RIVER and target_square != SquareType.RIVER and defender in {PieceType.RAT, PieceType.ELEPHANT}:
+            return MoveCheck.RAT_CAPTURES_FROM_WATER
+        if source_square != SquareType.RIVER and target_square == SquareType.RIVER and defender is PieceType.RAT:
+            return MoveCheck.RAT_ATTACKS_RAT_IN_WATER
+    elif defender is PieceType.RAT and attacker is PieceType.ELEPHANT:
+        return MoveCheck.ELEPHANT_CAPTURES_RAT
+
+    attacker_rank = attacker.definition.rank
+    defender_rank = defender.definition.rank
+
+    # A piece standing in one of its opponent's traps loses all rank.
+    if target_square == SquareType.TRAP_BLUE and defender_owner is PlayerSide.RED:
+        defender_rank = 0
+    if target_square == SquareType.TRAP_RED and defender_owner is PlayerSide.BLUE:
+        defender_rank = 0
+
+    if attacker_rank < defender_rank and not (attacker is PieceType.RAT and defender is PieceType.ELEPHANT):
+        return MoveCheck.RANK_TOO_LOW
+
+    if attacker is PieceType.RAT and defender is PieceType.ELEPHANT:
+        if source_square == SquareType.RIVER or target_square == SquareType.RIVER:
+            return MoveCheck.RAT_ATTACKS_ELEPHANT_FROM_RIVER
+    return MoveCheck.OK
+
+
+# Every capture outcome, indexed by (attacker type, defender type, defender
+# owner, source terrain, target terrain).  The attacker is always the
+# defender's opponent; taking one's own piece is rejected before the lookup.
+CaptureKey = Tuple[PieceType, PieceType, PlayerSide, SquareType, SquareType]
+CAPTURE_TABLE: Dict[CaptureKey, MoveCheck] = {
+    (attacker, defender, owner, source, target): _capture_rule(attacker, defender, owner, source, target)
+    for attacker in PieceType
+    for defender in PieceType
+    for owner in PlayerSide
+    for source in SquareType
+    for target in SquareType
+}
+
+
 def _mirror_position(position: Position) -> Position:
     return Position(row=BOARD_HEIGHT - 1 - position.row, col=BOARD_WIDTH - 1 - position.col)
 
@@ -49,6 +209,11 @@ def _mirror_position(position: Position) -> Position:
 @dataclass
 class Board:
     _pieces: Dict[PositionKey, Piece] = field(default_factory=dict)
+    _evaluator: Optional["Evaluator"] = field(
+        default=None, repr=False, compare=False)
+    _score: float = field(default=0.0, repr=False, compare=False)
+    _river_mask: int = field(default=0, repr=False, compare=False)
+    _hash: int = field(default=0, repr=False, compare=False)
 
     @staticmethod
     def initial() -> "Board":
@@ -62,11 +227,23 @@ class Board:
         return board
 
     def copy(self) -> "Board":
-        clone = Board()
-        for piece in self._pieces.values():
-            clone._place_piece(
-                Piece(piece_type=piece.piece_type, owner=piece.owner, position=piece.position))
-        return clone
+        # Pieces are immutable, so the copy can share them.
+        return Board(_pieces=dict(self._pieces), _evaluator=self._evaluator,
+                     _score=self._score, _river_mask=self._river_mask, _hash=self._hash)
+
+    def attach_evaluator(self, evaluator: Optional["Evaluator"]) -> None:
+        self._evaluator = evaluator
+        self._score = evaluator.evaluate(self) if evaluator else 0.0
+
+    def evaluation(self, side: PlayerSide = PlayerSide.BLUE) -> float:
+        """Score of the attached evaluator, kept up to date on every change."""
+        if self._evaluator is None:
+            raise ValueError("No evaluator attached to this board.")
+        return self._score if side is PlayerSide.BLUE else -self._score
+
+    def position_hash(self, to_move: PlayerSide) -> int:
+        """64-bit Zobrist hash of the pieces and the side to move."""
+        return self._hash ^ ZOBRIST_RED_TO_MOVE if to_move is PlayerSide.RED else self._hash
 
     def iter_pieces(self) -> Iterable[Piece]:
         return self._pieces.values()
@@ -75,25 +252,32 @@ class Board:
         return self._pieces.get(_pos_key(position))
 
     def remove_piece(self, position: Position) -> Optional[Piece]:
-        return self._pieces.pop(_pos_key(position), None)
+        key = _pos_key(position)
+        piece = self._pieces.pop(key, None)
+        if piece is not None:
+            self._river_mask &= ~RIVER_BITS.get(key, 0)
+            self._hash ^= _zobrist(piece)
+            if self._evaluator is not None:
+                self._score -= self._evaluator.piece_value(piece)
+        return piece
 
     def _place_piece(self, piece: Piece) -> None:
-        self._pieces[_pos_key(piece.position)] = piece
+        key = _pos_key(piece.position)
+        self._river_mask |= RIVER_BITS.get(key, 0)
+        replaced = self._pieces.get(key)
+        if replaced is not None:
+            self._hash ^= _zobrist(replaced)
+        self._hash ^= _zobrist(piece)
+        if self._evaluator is not None:
+            if replaced is not None:
+                self._score -= self._evaluator.piece_value(replaced)
+            self._score += self._evaluator.piece_value(piece)
+        self._pieces[key] = piece
 
     def move(self, player: PlayerSide, source: Position, target: Position) -> Tuple[Piece, Optional[Piece]]:
-        self._validate_basic_coordinates(source, target)
-        piece = self.piece_at(source)
-        if not piece:
-            raise InvalidMoveError("No piece on the source square.")
-        if piece.owner is not player:
-            raise InvalidMoveError("You can only move your own pieces.")
-
-        captured = self.piece_at(target)
-        if captured and captured.owner is player:
-            raise InvalidMoveError(
-                "Target square already filled by your piece.")
-
-        self._validate_movement(piece, source, target, captured)
+        code, piece, captured = self._check(player, source, target)
+        if code is not MoveCheck.OK or piece is None:
+            raise InvalidMoveError.from_check(code)
 
         self.remove_piece(source)
         if captured:
@@ -104,128 +288,157 @@ class Board:
 
         return moved_piece, captured
 
+    def check_move(self, player: PlayerSide, source: Position, target: Position) -> MoveCheck:
+        """Validate a move without mutating the board or raising."""
+        return self._check(player, source, target)[0]
+
+    def check_moves(self, player: PlayerSide, candidates: Sequence[Tuple[Position, Position]]) -> List[MoveCheck]:
+        check = self._check
+        return [check(player, source, target)[0] for source, target in candidates]
+
+    def is_legal(self, player: PlayerSide, source: Position, target: Position) -> bool:
+        return self._check(player, source, target)[0] is MoveCheck.OK
+
+    def candidate_targets(self, piece: Piece) -> List[Position]:
+        """Squares a piece could reach by geometry alone, before rule checks."""
+        targets: List[Position] = []
+        can_jump = piece.piece_type.definition.can_jump
+        for d_row, d_col in DIRECTIONS:
+            row, col = piece.position.row + d_row, piece.position.col + d_col
+            if not in_bounds(row, col):
+                continue
+            if can_jump and (row, col) in RIVER_COORDS:
+                while (row, col) in RIVER_COORDS:
+                    row, col = row + d_row, col + d_col
+                if not in_bounds(row, col):
+                    continue
+            targets.append(Position(row, col))
+        return targets
+
+    def legal_moves(self, player: PlayerSide) -> List[Tuple[Position, Position]]:
+        # Sorted by square so the order does not depend on how the position
+        # was reached; cached move lists are shared between transpositions.
+        return [
+            (piece.position, target)
+            for _, piece in sorted(self._pieces.items())
+            if piece.owner is player
+            for target in self.candidate_targets(piece)
+            if self._check(player, piece.position, target)[0] is MoveCheck.OK
+        ]
+
+    @property
+    def river_mask(self) -> int:
+        """Bitmask of occupied river squares (see ``RIVER_BITS``)."""
+        return self._river_mask
+
+    def distance_to(self, piece: Piece, target: Position) -> Optional[int]:
+        """Fewest moves for ``piece`` to reach ``target`` on this board.
+
+        Only river occupants are taken into account (they block lion and tiger
+        jumps); other pieces are assumed to move out of the way.
+        """
+        from .distances import distance
+        return distance(piece.piece_type, piece.owner, piece.position, target, self._river_mask)
+
+    def distance_to_den(self, piece: Piece, den_owner: Optional[PlayerSide] = None) -> Optional[int]:
+        owner = den_owner or piece.owner.opponent()
+        return self.distance_to(piece, BLUE_DEN if owner is PlayerSide.BLUE else RED_DEN)
+
+    def distance_to_trap(self, piece: Piece, trap: Position) -> Optional[int]:
+        if trap not in BLUE_TRAPS and trap not in RED_TRAPS:
+            raise ValueError(f"{trap.to_notation()} is not a trap square.")
+        return self.distance_to(piece, trap)
+
     def square_type(self, position: Position) -> SquareType:
-        key = _pos_key(position)
-        if key in RIVER_COORDS:
-            return SquareType.RIVER
-        if position == BLUE_DEN:
-            return SquareType.DEN_BLUE
-        if position == RED_DEN:
-            return SquareType.DEN_RED
-        if position in BLUE_TRAPS:
-            return SquareType.TRAP_BLUE
-        if position in RED_TRAPS:
-            return SquareType.TRAP_RED
-        return SquareType.LAND
-
-    def _validate_basic_coordinates(self, source: Position, target: Position) -> None:
+        return SQUARE_TYPES.get((position.row, position.col), SquareType.LAND)
+
+    def _check(self, player: PlayerSide, source: Position, target: Position) -> Tuple[MoveCheck, Optional[Piece], Optional[Piece]]:
+        code = self._check_basic_coordinates(source, target)
+        if code is not MoveCheck.OK:
+            return code, None, None
+        piece = self.piece_at(source)
+        if not piece:
+            return MoveCheck.NO_PIECE, None, None
+        if piece.owner is not player:
+            return MoveCheck.NOT_OWN_PIECE, piece, None
+
+        captured = self.piece_at(target)
+        if captured and captured.owner is player:
+            return MoveCheck.TARGET_OCCUPIED_BY_OWN, piece, captured
+
+        return self._check_movement(piece, source, target, captured), piece, captured
+
+    def _check_basic_coordinates(self, source: Position, target: Position) -> MoveCheck:
         if not in_bounds(source.row, source.col) or not in_bounds(target.row, target.col):
-            raise InvalidMoveError("Move must remain inside the board.")
+            return MoveCheck.OUT_OF_BOUNDS
         if source == target:
-            raise InvalidMoveError("Source and target squares differ.")
+            return MoveCheck.SAME_SQUARE
+        return MoveCheck.OK
 
-    def _validate_movement(self, piece: Piece, source: Position, target: Position, captured: Optional[Piece]) -> None:
+    def _check_movement(self, piece: Piece, source: Position, target: Position, captured: Optional[Piece]) -> MoveCheck:
         target_square = self.square_type(target)
         source_square = self.square_type(source)
 
         if target_square.is_den and ((target_square == SquareType.DEN_BLUE and piece.owner is PlayerSide.BLUE) or (target_square == SquareType.DEN_RED and piece.owner is PlayerSide.RED)):
-            raise InvalidMoveError("You may not enter your own den.")
+            return MoveCheck.OWN_DEN
 
         if target_square == SquareType.RIVER and not piece.piece_type.definition.can_swim:
-            raise InvalidMoveError("Only rats may enter the river.")
+            return MoveCheck.RIVER_FORBIDDEN
 
         dy, dx = source.delta(target)
         manhattan = abs(dy) + abs(dx)
 
         if manhattan == 1:
-            self._validate_capture(piece, source_square,
-                                   target_square, captured, source, target)
-            return
+            return self._check_capture(piece, source_square, target_square, captured)
 
         if piece.piece_type.definition.can_jump and (dy == 0 or dx == 0):
-            self._validate_jump(piece, source, target, captured)
-            return
+            return self._check_jump(piece, source, target, captured)
 
-        raise InvalidMoveError(
-            "Illegal movement. Pieces move one square orthogonally, lions/tigers may jump rivers.")
+        return MoveCheck.ILLEGAL_MOVEMENT
 
-    def _validate_jump(self, piece: Piece, source: Position, target: Position, captured: Optional[Piece]) -> None:
+    def _check_jump(self, piece: Piece, source: Position, target: Position, captured: Optional[Piece]) -> MoveCheck:
         direction_row = 0 if source.row == target.row else (
             1 if target.row > source.row else -1)
         direction_col = 0 if source.col == target.col else (
             1 if target.col > source.col else -1)
 
         if direction_row != 0 and direction_col != 0:
-            raise InvalidMoveError("Jumping must be horizontal or vertical.")
+            return MoveCheck.JUMP_NOT_STRAIGHT
 
         current = Position(source.row + direction_row,
                            source.col + direction_col)
         encountered_water = False
         while current != target:
             if not in_bounds(current.row, current.col):
-                raise InvalidMoveError("Jump exceeds board boundaries.")
+                return MoveCheck.JUMP_OUT_OF_BOUNDS
             if self.square_type(current) != SquareType.RIVER:
-                raise InvalidMoveError(
-                    "Lions and tigers may only jump over rivers.")
+                return MoveCheck.JUMP_OVER_LAND
             encountered_water = True
             blocking_piece = self.piece_at(current)
             if blocking_piece:
-                raise InvalidMoveError(
-                    "Cannot jump because a rat blocks the river path.")
+                return MoveCheck.JUMP_BLOCKED_BY_RAT
             current = Position(current.row + direction_row,
                                current.col + direction_col)
 
         if not encountered_water:
-            raise InvalidMoveError(
-                "Jump must cross at least one river square.")
+            return MoveCheck.JUMP_WITHOUT_RIVER
 
         if self.square_type(target) == SquareType.RIVER:
-            raise InvalidMoveError(
-                "Jump lands on land immediately beyond the river.")
+            return MoveCheck.JUMP_INTO_RIVER
 
-        self._validate_capture(piece, self.square_type(
-            source), self.square_type(target), captured, source, target)
+        return self._check_capture(piece, self.square_type(
+            source), self.square_type(target), captured)
 
-    def _validate_capture(
+    def _check_capture(
         self,
         piece: Piece,
         source_square: SquareType,
         target_square: SquareType,
         captured: Optional[Piece],
-        source: Position,
-        target: Position,
-    ) -> None:
+    ) -> MoveCheck:
         if not captured:
-            return
-
+            return MoveCheck.OK
         if captured.owner is piece.owner:
-            raise InvalidMoveError("Cannot capture your own piece.")
-
-        if piece.piece_type is PieceType.RAT:
-            self._validate_rat_capture(source_square, target_square, captured)
-        elif captured.piece_type is PieceType.RAT and piece.piece_type is PieceType.ELEPHANT:
-            raise InvalidMoveError("Elephants cannot capture rats.")
-
-        attacker_rank = piece.piece_type.definition.rank
-        defender_rank = captured.piece_type.definition.rank
-
-        if target_square == SquareType.TRAP_BLUE and captured.owner is PlayerSide.RED:
-            defender_rank = 0
-        if target_square == SquareType.TRAP_RED and captured.owner is PlayerSide.BLUE:
-            defender_rank = 0
-
-        if attacker_rank < defender_rank and not (piece.piece_type is PieceType.RAT and captured.piece_type is PieceType.ELEPHANT):
-            raise InvalidMoveError("Attacker rank too low to capture target.")
-
-        if piece.piece_type is PieceType.RAT and captured.piece_type is PieceType.ELEPHANT:
-            if source_square == SquareType.RIVER or target_square == SquareType.RIVER:
-                raise InvalidMoveError(
-                    "Rats cannot attack elephants from river squares.")
-
-    def _validate_rat_capture(self, source_square: SquareType, target_square: SquareType, captured: Piece) -> None:
-        if source_square == SquareType.RIVER and target_square != SquareType.RIVER and captured.piece_type in {PieceType.RAT, PieceType.ELEPHANT}:
-            raise InvalidMoveError(
-                "A rat cannot capture an elephant or rat on land directly from water.")
-        if source_square != SquareType.RIVER and target_square == SquareType.RIVER and captured.piece_type is PieceType.RAT:
-            raise InvalidMoveError(
-                "A rat on land cannot attack a rat in the water.")
+            return MoveCheck.CAPTURE_OWN_PIECE
+        return CAPTURE_TABLE[piece.piece_type, captured.piece_type,
+                             captured.owner, source_square, target_square]
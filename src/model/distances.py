@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .board import BLUE_DEN, BLUE_TRAPS, DIRECTIONS, RED_DEN, RED_TRAPS, RIVER_BITS, RIVER_COORDS
+from .enums import PieceType, PlayerSide
+from .position import BOARD_HEIGHT, BOARD_WIDTH, Position, in_bounds
+
+# Shortest move counts ("plies of the moving side") between squares, taking
+# river rules into account.  Tables are flat tuples indexed by
+# ``row * BOARD_WIDTH + col``; squares that cannot reach the target hold
+# UNREACHABLE.
+UNREACHABLE = -1
+SQUARE_COUNT = BOARD_HEIGHT * BOARD_WIDTH
+
+DistanceTable = Tuple[int, ...]
+
+DEN_TARGETS = (BLUE_DEN, RED_DEN)
+TRAP_TARGETS = tuple(sorted(BLUE_TRAPS | RED_TRAPS,
+                     key=lambda position: (position.row, position.col)))
+
+
+def _movement_class(piece_type: PieceType) -> str:
+    definition = piece_type.definition
+    if definition.can_swim:
+        return "swim"
+    if definition.can_jump:
+        return "jump"
+    return "walk"
+
+
+def _index(row: int, col: int) -> int:
+    return row * BOARD_WIDTH + col
+
+
+def _neighbours(row: int, col: int, movement: str, river_mask: int) -> List[Tuple[int, int]]:
+    result = []
+    for d_row, d_col in DIRECTIONS:
+        n_row, n_col = row + d_row, col + d_col
+        if not in_bounds(n_row, n_col):
+            continue
+        if (n_row, n_col) in RIVER_COORDS:
+            if movement == "swim":
+                result.append((n_row, n_col))
+                continue
+            if movement != "jump":
+                continue
+            blocked = False
+            while (n_row, n_col) in RIVER_COORDS:
+                blocked = blocked or bool(river_mask & RIVER_BITS[n_row, n_col])
+                n_row, n_col = n_row + d_row, n_col + d_col
+            if blocked or not in_bounds(n_row, n_col):
+                continue
+        result.append((n_row, n_col))
+    return result
+
+
+def _bfs(target: Position, movement: str, owner: PlayerSide, river_mask: int) -> DistanceTable:
+    own_den = BLUE_DEN if owner is PlayerSide.BLUE else RED_DEN
+    distances = [UNREACHABLE] * SQUARE_COUNT
+    if target == own_den:
+        return tuple(distances)
+    if (target.row, target.col) in RIVER_COORDS and movement != "swim":
+        return tuple(distances)
+
+    dens = {(BLUE_DEN.row, BLUE_DEN.col), (RED_DEN.row, RED_DEN.col)}
+    start = (target.row, target.col)
+    distances[_index(*start)] = 0
+    queue = deque([start])
+    # Moves are reversible, so a BFS outwards from the target gives every
+    # square's distance to it.  Dens are never passed through: entering one is
+    # either forbidden or ends the game.
+    while queue:
+        row, col = queue.popleft()
+        step = distances[_index(row, col)] + 1
+        for n_row, n_col in _neighbours(row, col, movement, river_mask):
+            index = _index(n_row, n_col)
+            if distances[index] != UNREACHABLE or (n_row, n_col) in dens:
+                continue
+            distances[index] = step
+            queue.append((n_row, n_col))
+    return tuple(distances)
+
+
+@lru_cache(maxsize=4096)
+def _table(movement: str, owner: PlayerSide, target: Position, river_mask: int) -> DistanceTable:
+    return _bfs(target, movement, owner, river_mask)
+
+
+# Static tables for an empty river, built once at import.
+STATIC_TABLES: Dict[Tuple[str, PlayerSide, Position], DistanceTable] = {
+    (movement, owner, target): _table(movement, owner, target, 0)
+    for movement in ("walk", "swim", "jump")
+    for owner in PlayerSide
+    for target in DEN_TARGETS + TRAP_TARGETS
+}
+
+
+def distance_table(piece_type: PieceType, owner: PlayerSide, target: Position, river_mask: int = 0) -> DistanceTable:
+    """Distance table towards ``target``; ``river_mask`` marks occupied river squares.
+
+    Only lions and tigers are affected by river occupants, so other pieces
+    always use the static table.  Tables for other masks are computed on first
+    use and cached.
+    """
+    movement = _movement_class(piece_type)
+    if movement != "jump":
+        river_mask = 0
+    table = STATIC_TABLES.get((movement, owner, target)) if not river_mask else None
+    return table if table is not None else _table(movement, owner, target, river_mask)
+
+
+def distance(piece_type: PieceType, owner: PlayerSide, source: Position, target: Position, river_mask: int = 0) -> Optional[int]:
+    value = distance_table(piece_type, owner, target, river_mask)[
+        _index(source.row, source.col)]
+    return None if value == UNREACHABLE else value
@@ -12,6 +12,11 @@ class PlayerSide(str, Enum):
         return PlayerSide.RED if self is PlayerSide.BLUE else PlayerSide.BLUE
 
 
+class DrawReason(str, Enum):
+    REPETITION = "REPETITION"
+    NO_CAPTURE = "NO_CAPTURE"
+
+
 class SquareType(str, Enum):
     LAND = "LAND"
     RIVER = "RIVER"
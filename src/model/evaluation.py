@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .board import BLUE_DEN, BLUE_TRAPS, RED_DEN, RED_TRAPS, RIVER_COORDS, Board
+from .distances import distance
+from .enums import PieceType, PlayerSide
+from .piece import Piece
+from .position import BOARD_HEIGHT, BOARD_WIDTH, Position
+
+SquareTable = Tuple[float, ...]
+
+
+@dataclass(frozen=True)
+class EvaluationWeights:
+    material: float = 100.0
+    den_distance: float = 4.0
+    trap_danger: float = 0.5
+    river_control: float = 3.0
+    mobility: float = 2.0
+
+    @staticmethod
+    def from_dict(payload: dict) -> "EvaluationWeights":
+        known = {f.name for f in fields(EvaluationWeights)}
+        unknown = set(payload) - known
+        if unknown:
+            raise ValueError(
+                f"Unknown evaluation weight(s): {', '.join(sorted(unknown))}")
+        return EvaluationWeights(**{key: float(value) for key, value in payload.items()})
+
+    @staticmethod
+    def load(source: Path) -> "EvaluationWeights":
+        return EvaluationWeights.from_dict(json.loads(Path(source).read_text(encoding="utf-8")))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def save(self, destination: Path) -> None:
+        Path(destination).write_text(json.dumps(
+            self.to_dict(), indent=2), encoding="utf-8")
+
+
+class Evaluator:
+    """Static evaluation built from per-piece-type square tables.
+
+    Every term depends only on a piece and the square it stands on, so a
+    position's score is the sum of table entries.  Boards with an attached
+    evaluator keep that sum up to date as pieces are placed and removed.
+    """
+
+    def __init__(self, weights: EvaluationWeights = EvaluationWeights()) -> None:
+        self.weights = weights
+        self.tables: Dict[Tuple[PieceType, PlayerSide], SquareTable] = {
+            (piece_type, owner): _build_table(piece_type, owner, weights)
+            for piece_type in PieceType
+            for owner in PlayerSide
+        }
+
+    @staticmethod
+    def from_file(source: Path) -> "Evaluator":
+        return Evaluator(EvaluationWeights.load(source))
+
+    def piece_value(self, piece: Piece) -> float:
+        """Contribution of ``piece`` to the score, from BLUE's point of view."""
+        value = self.tables[piece.piece_type, piece.owner][
+            piece.position.row * BOARD_WIDTH + piece.position.col]
+        return value if piece.owner is PlayerSide.BLUE else -value
+
+    def evaluate(self, board: Board, side: PlayerSide = PlayerSide.BLUE) -> float:
+        """Score ``board`` from scratch; ``Board.evaluation`` is the O(1) equivalent."""
+        score = sum(self.piece_value(piece) for piece in board.iter_pieces())
+        return score if side is PlayerSide.BLUE else -score
+
+
+def _build_table(piece_type: PieceType, owner: PlayerSide, weights: EvaluationWeights) -> SquareTable:
+    definition = piece_type.definition
+    target_den = RED_DEN if owner is PlayerSide.BLUE else BLUE_DEN
+    own_den = BLUE_DEN if owner is PlayerSide.BLUE else RED_DEN
+    hostile_traps = RED_TRAPS if owner is PlayerSide.BLUE else BLUE_TRAPS
+
+    values = []
+    for row in range(BOARD_HEIGHT):
+        for col in range(BOARD_WIDTH):
+            position = Position(row, col)
+            value = weights.material * definition.rank
+            steps = distance(piece_type, owner, position, target_den)
+            if steps is None:
+                steps = abs(row - target_den.row) + abs(col - target_den.col)
+            value -= weights.den_distance * steps
+            if position in hostile_traps:
+                # A piece on an enemy trap can be taken by anything.
+                value -= weights.trap_danger * weights.material * definition.rank
+            value += weights.river_control * _river_control(piece_type, row, col)
+            value += weights.mobility * _static_mobility(
+                piece_type, position, own_den)
+            values.append(value)
+    return tuple(values)
+
+
+def _river_control(piece_type: PieceType, row: int, col: int) -> int:
+    definition = piece_type.definition
+    if definition.can_swim and (row, col) in RIVER_COORDS:
+        return 1
+    if definition.can_jump and _on_river_bank(row, col):
+        return 1
+    return 0
+
+
+def _on_river_bank(row: int, col: int) -> bool:
+    if (row, col) in RIVER_COORDS:
+        return False
+    return any((row + d_row, col + d_col) in RIVER_COORDS
+               for d_row, d_col in ((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+
+def _static_mobility(piece_type: PieceType, position: Position, own_den: Position) -> int:
+    """Number of squares the piece could move to from here on an empty board."""
+    if (position.row, position.col) in RIVER_COORDS and not piece_type.definition.can_swim:
+        return 0
+    probe = Board()
+    piece = Piece(piece_type, PlayerSide.BLUE, position)
+    return sum(
+        1 for target in probe.candidate_targets(piece)
+        if target != own_den
+        and ((target.row, target.col) not in RIVER_COORDS or piece_type.definition.can_swim)
+    )
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Deque, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .enums import DrawReason, PlayerSide
+from .position import Position
+from .snapshot import BoardVersion
+
+
+class BackpressurePolicy(str, Enum):
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    DISCONNECT = "disconnect"
+
+
+@dataclass(frozen=True)
+class SquareChange:
+    square: str
+    piece: Optional[str]
+
+
+@dataclass(frozen=True)
+class MoveApplied:
+    seq: int
+    ply: int
+    player: PlayerSide
+    piece: str
+    source: str
+    target: str
+    capture: Optional[str]
+    changes: Tuple[SquareChange, ...]
+
+
+@dataclass(frozen=True)
+class MoveUndone:
+    seq: int
+    ply: int
+    current_player: PlayerSide
+    requester: PlayerSide
+    changes: Tuple[SquareChange, ...]
+
+
+@dataclass(frozen=True)
+class WinnerDecided:
+    seq: int
+    ply: int
+    winner: PlayerSide
+
+
+@dataclass(frozen=True)
+class DrawDeclared:
+    seq: int
+    ply: int
+    reason: DrawReason
+
+
+@dataclass(frozen=True)
+class PlayerRenamed:
+    seq: int
+    side: PlayerSide
+    name: str
+
+
+GameEvent = Union[MoveApplied, MoveUndone, WinnerDecided, DrawDeclared, PlayerRenamed]
+
+_EVENT_TYPES = {
+    MoveApplied: "move",
+    MoveUndone: "undo",
+    WinnerDecided: "winner",
+    DrawDeclared: "draw",
+    PlayerRenamed: "rename",
+}
+
+
+def board_changes(before: BoardVersion, after: BoardVersion) -> Tuple[SquareChange, ...]:
+    """Squares that differ between two versions; shared rows are skipped."""
+    changes: List[SquareChange] = []
+    for row, (old_row, new_row) in enumerate(zip(before.rows, after.rows)):
+        if old_row is new_row:
+            continue
+        for col, (old, new) in enumerate(zip(old_row, new_row)):
+            if old != new:
+                changes.append(SquareChange(
+                    Position(row, col).to_notation(), new.notation if new else None))
+    return tuple(changes)
+
+
+class Subscription:
+    """Bounded event queue for one observer.
+
+    The game thread never blocks on a slow observer: when the queue is full
+    the subscription's policy drops an event or disconnects the observer.
+    """
+
+    def __init__(self, maxsize: int, policy: BackpressurePolicy) -> None:
+        if maxsize < 1:
+            raise ValueError("Subscription queue size must be at least 1.")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._queue: Deque[GameEvent] = deque()
+        self._ready = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def offer(self, event: GameEvent) -> bool:
+        """Queue ``event``; returns False once the subscription is closed."""
+        with self._ready:
+            if self.closed:
+                return False
+            if len(self._queue) >= self.maxsize:
+                self.dropped += 1
+                if self.policy is BackpressurePolicy.DISCONNECT:
+                    self.closed = True
+                    self._ready.notify_all()
+                    return False
+                if self.policy is BackpressurePolicy.DROP_NEWEST:
+                    return True
+                self._queue.popleft()
+            self._queue.append(event)
+            self._ready.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[GameEvent]:
+        """Next event, or None when closed and drained or on timeout."""
+        with self._ready:
+            if not self._queue and not self.closed:
+                self._ready.wait(timeout)
+            return self._queue.popleft() if self._queue else None
+
+    def drain(self) -> List[GameEvent]:
+        with self._ready:
+            events = list(self._queue)
+            self._queue.clear()
+            return events
+
+    def close(self) -> None:
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+    def __iter__(self) -> Iterator[GameEvent]:
+        while True:
+            event = self.get()
+            if event is None:
+                if self.closed:
+                    return
+                continue
+            yield event
+
+
+class EventStream:
+    def __init__(self) -> None:
+        self._subscriptions: List[Subscription] = []
+        self._listeners: List[Callable[[GameEvent], None]] = []
+        self._seq = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self._subscriptions or self._listeners)
+
+    def next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def subscribe(self, maxsize: int = 256, policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST) -> Subscription:
+        subscription = Subscription(maxsize, policy)
+        self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        self._subscriptions = [
+            s for s in self._subscriptions if s is not subscription]
+
+    def add_listener(self, listener: Callable[[GameEvent], None]) -> None:
+        """Call ``listener`` synchronously on the game thread for every event.
+
+        Listeners run after the change is applied and must not raise: an
+        exception would reach the caller of ``move``/``undo`` as if the change
+        had been refused.
+        """
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[GameEvent], None]) -> None:
+        self._listeners = [l for l in self._listeners if l != listener]
+
+    def publish(self, event: GameEvent) -> None:
+        # Subscribers are offered the event before listeners run, so a
+        # listener that raises cannot keep it from them.
+        disconnected = [s for s in self._subscriptions if not s.offer(event)]
+        if disconnected:
+            self._subscriptions = [
+                s for s in self._subscriptions if s not in disconnected]
+        for listener in self._listeners:
+            listener(event)
+
+
+@lru_cache(maxsize=1024)
+def event_to_json(event: GameEvent) -> str:
+    """Compact single-line JSON for ``event``; cached so fan-out encodes once."""
+    payload: dict = {"type": _EVENT_TYPES[type(event)], "seq": event.seq}
+    if isinstance(event, MoveApplied):
+        payload.update(ply=event.ply, player=event.player.value, piece=event.piece,
+                       src=event.source, dst=event.target, capture=event.capture)
+    elif isinstance(event, MoveUndone):
+        payload.update(ply=event.ply, turn=event.current_player.value,
+                       by=event.requester.value)
+    elif isinstance(event, WinnerDecided):
+        payload.update(ply=event.ply, winner=event.winner.value)
+    elif isinstance(event, DrawDeclared):
+        payload.update(ply=event.ply, reason=event.reason.value)
+    elif isinstance(event, PlayerRenamed):
+        payload.update(side=event.side.value, name=event.name)
+    if isinstance(event, (MoveApplied, MoveUndone)):
+        payload["changes"] = [[change.square, change.piece]
+                              for change in event.changes]
+    return json.dumps(payload, separators=(",", ":"))
+
+
+class JsonLinesWriter:
+    """Forwards a subscription to a text stream as one JSON object per line."""
+
+    def __init__(self, subscription: Subscription, stream: TextIO) -> None:
+        self.subscription = subscription
+        self.stream = stream
+
+    def pump(self, timeout: Optional[float] = None) -> int:
+        """Write everything queued (waiting up to ``timeout`` for the first event)."""
+        event = self.subscription.get(timeout)
+        if event is None:
+            return 0
+        events = [event] + self.subscription.drain()
+        self.stream.write("".join(event_to_json(e) + "\n" for e in events))
+        self.stream.flush()
+        return len(events)
+
+    def run(self) -> None:
+        """Forward events until the subscription is closed."""
+        for event in self.subscription:
+            self.stream.write(event_to_json(event) + "\n")
+            self.stream.flush()
@@ -1,24 +1,51 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .board import Board, BLUE_DEN, RED_DEN, InvalidMoveError
-from .enums import PieceType, PlayerSide
+from .enums import DrawReason, PieceType, PlayerSide
+from .events import (
+    BackpressurePolicy,
+    DrawDeclared,
+    EventStream,
+    MoveApplied,
+    MoveUndone,
+    PlayerRenamed,
+    Subscription,
+    WinnerDecided,
+    board_changes,
+)
 from .move import Move
 from .piece import Piece
+from .position_cache import PositionCache
 from .position import Position
+from .snapshot import BoardVersion, GameSnapshot
 
 
 UNDO_LIMIT = 3
 
 
+def victory_after_move(board: Board, moved_piece: Piece, captured: Optional[Piece]) -> Optional[PlayerSide]:
+    if moved_piece.owner is PlayerSide.BLUE and moved_piece.position == RED_DEN:
+        return PlayerSide.BLUE
+    if moved_piece.owner is PlayerSide.RED and moved_piece.position == BLUE_DEN:
+        return PlayerSide.RED
+
+    if captured and not any(p.owner is captured.owner for p in board.iter_pieces()):
+        return moved_piece.owner
+    return None
+
+
 @dataclass
 class HistorySnapshot:
     board: Board
     current_player: PlayerSide
     winner: Optional[PlayerSide]
     move_log_size: int
+    board_version: Optional[BoardVersion] = None
+    draw_reason: Optional[DrawReason] = None
+    plies_since_capture: int = 0
 
 
 @dataclass
@@ -30,8 +57,41 @@ class GameState:
     winner: Optional[PlayerSide] = None
     undo_remaining: Dict[PlayerSide, int] = field(
         default_factory=lambda: {PlayerSide.BLUE: UNDO_LIMIT, PlayerSide.RED: UNDO_LIMIT})
+    # A game ends without a winner when the same position (with the same side
+    # to move) occurs ``repetition_limit`` times, or after ``no_capture_limit``
+    # plies in a row without a capture. Either limit is off when None.
+    repetition_limit: Optional[int] = None
+    no_capture_limit: Optional[int] = None
+    draw_reason: Optional[DrawReason] = None
+    plies_since_capture: int = 0
     _history: List[HistorySnapshot] = field(default_factory=list)
     _move_log: List[Move] = field(default_factory=list)
+    _published: Optional[GameSnapshot] = field(
+        default=None, repr=False, compare=False)
+    _events: EventStream = field(
+        default_factory=EventStream, repr=False, compare=False)
+    # Occurrences of each position hash reached in this game; undo rolls
+    # them back, so repetition checks never rescan the move log.
+    _positions: Dict[int, int] = field(
+        default_factory=dict, repr=False, compare=False)
+    # Optional shared cache for legal moves and analysis of visited positions.
+    cache: Optional[PositionCache] = field(
+        default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._reset_positions()
+        self._publish(BoardVersion.from_board(self.board))
+
+    def _reset_positions(self) -> None:
+        self._positions = {self.board.position_hash(self.current_player): 1}
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner is not None or self.draw_reason is not None
+
+    def repetitions(self) -> int:
+        """How often the current position has occurred so far."""
+        return self._positions.get(self.board.position_hash(self.current_player), 0)
 
     @staticmethod
     def new(player_blue: Optional[str] = None, player_red: Optional[str] = None) -> "GameState":
@@ -40,12 +100,50 @@ class GameState:
             state.player_names[PlayerSide.BLUE] = player_blue
         if player_red:
             state.player_names[PlayerSide.RED] = player_red
+        state._publish()
         return state
 
     def rename_player(self, side: PlayerSide, name: str) -> None:
         if not name.strip():
             raise ValueError("Player name may not be empty.")
         self.player_names[side] = name.strip()
+        self._publish()
+        if self._events.active:
+            self._events.publish(PlayerRenamed(
+                self._events.next_seq(), side, self.player_names[side]))
+
+    @property
+    def events(self) -> EventStream:
+        return self._events
+
+    def subscribe(self, maxsize: int = 256, policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST) -> Subscription:
+        """Observe moves, undos, results and renames through a bounded queue."""
+        return self._events.subscribe(maxsize, policy)
+
+    def snapshot(self) -> GameSnapshot:
+        """Latest published view of the game; safe to read from any thread.
+
+        Snapshots are immutable and replaced wholesale after every change, so
+        a reader holding one never observes a half-applied move.
+        """
+        assert self._published is not None
+        return self._published
+
+    def _publish(self, board_version: Optional[BoardVersion] = None) -> None:
+        previous = self._published
+        if board_version is None:
+            assert previous is not None
+            board_version = previous.board
+        # A single attribute store: readers see either the old or the new view.
+        self._published = GameSnapshot(
+            version=previous.version + 1 if previous else 0,
+            board=board_version,
+            current_player=self.current_player,
+            winner=self.winner,
+            move_count=len(self._move_log),
+            player_names=tuple(self.player_names.items()),
+            draw_reason=self.draw_reason,
+        )
 
     def available_moves(self) -> int:
         return len(self._move_log)
@@ -53,8 +151,15 @@ class GameState:
     def last_moves(self, count: int = 5) -> List[Move]:
         return self._move_log[-count:]
 
+    def legal_moves(self) -> List[Tuple[Position, Position]]:
+        if self.is_over:
+            return []
+        if self.cache is not None:
+            return self.cache.legal_moves(self.board, self.current_player)
+        return self.board.legal_moves(self.current_player)
+
     def move(self, src: Position, dst: Position) -> Move:
-        if self.winner:
+        if self.is_over:
             raise InvalidMoveError("The game has already finished.")
 
         snapshot = self._create_snapshot()
@@ -74,18 +179,49 @@ class GameState:
             self.winner = victor
 
         self.current_player = self.current_player.opponent()
+        self.plies_since_capture = 0 if captured else self.plies_since_capture + 1
+        key = self.board.position_hash(self.current_player)
+        occurrences = self._positions.get(key, 0) + 1
+        self._positions[key] = occurrences
+        if not self.winner:
+            self.draw_reason = self._draw_after_move(occurrences)
+
+        previous = self.snapshot()
+        self._publish(previous.board.with_changes(
+            [((src.row, src.col), None), ((dst.row, dst.col), moved_piece)]))
+        if self._events.active:
+            self._emit_move(previous, moved_piece, captured, src, dst)
         return move_record
 
-    def _determine_victory(self, moved_piece: Piece, captured: Optional[Piece]) -> Optional[PlayerSide]:
-        if moved_piece.owner is PlayerSide.BLUE and moved_piece.position == RED_DEN:
-            return PlayerSide.BLUE
-        if moved_piece.owner is PlayerSide.RED and moved_piece.position == BLUE_DEN:
-            return PlayerSide.RED
+    def _emit_move(self, previous: GameSnapshot, moved_piece: Piece, captured: Optional[Piece], src: Position, dst: Position) -> None:
+        current = self.snapshot()
+        self._events.publish(MoveApplied(
+            seq=self._events.next_seq(),
+            ply=current.move_count,
+            player=moved_piece.owner,
+            piece=moved_piece.notation,
+            source=src.to_notation(),
+            target=dst.to_notation(),
+            capture=captured.notation if captured else None,
+            changes=board_changes(previous.board, current.board),
+        ))
+        if current.winner and not previous.winner:
+            self._events.publish(WinnerDecided(
+                self._events.next_seq(), current.move_count, current.winner))
+        if current.draw_reason and not previous.draw_reason:
+            self._events.publish(DrawDeclared(
+                self._events.next_seq(), current.move_count, current.draw_reason))
 
-        if captured and not any(p.owner is captured.owner for p in self.board.iter_pieces()):
-            return moved_piece.owner
+    def _draw_after_move(self, occurrences: int) -> Optional[DrawReason]:
+        if self.repetition_limit and occurrences >= self.repetition_limit:
+            return DrawReason.REPETITION
+        if self.no_capture_limit and self.plies_since_capture >= self.no_capture_limit:
+            return DrawReason.NO_CAPTURE
         return None
 
+    def _determine_victory(self, moved_piece: Piece, captured: Optional[Piece]) -> Optional[PlayerSide]:
+        return victory_after_move(self.board, moved_piece, captured)
+
     def undo(self, requester: PlayerSide) -> None:
         if not self._history:
             raise InvalidMoveError("No moves to undo.")
@@ -94,12 +230,31 @@ class GameState:
                 "Undo limit reached (max three per player).")
 
         snapshot = self._history.pop()
+        key = self.board.position_hash(self.current_player)
+        remaining = self._positions.get(key, 0) - 1
+        if remaining > 0:
+            self._positions[key] = remaining
+        else:
+            self._positions.pop(key, None)
         self.board = snapshot.board
         self.current_player = snapshot.current_player
         self.winner = snapshot.winner
+        self.draw_reason = snapshot.draw_reason
+        self.plies_since_capture = snapshot.plies_since_capture
         while len(self._move_log) > snapshot.move_log_size:
             self._move_log.pop()
         self.undo_remaining[requester] -= 1
+        previous = self.snapshot()
+        self._publish(snapshot.board_version or BoardVersion.from_board(self.board))
+        if self._events.active:
+            current = self.snapshot()
+            self._events.publish(MoveUndone(
+                seq=self._events.next_seq(),
+                ply=current.move_count,
+                current_player=current.current_player,
+                requester=requester,
+                changes=board_changes(previous.board, current.board),
+            ))
 
     def _create_snapshot(self) -> HistorySnapshot:
         return HistorySnapshot(
@@ -107,6 +262,9 @@ class GameState:
             current_player=self.current_player,
             winner=self.winner,
             move_log_size=len(self._move_log),
+            board_version=self._published.board if self._published else None,
+            draw_reason=self.draw_reason,
+            plies_since_capture=self.plies_since_capture,
         )
 
     def to_dict(self) -> dict:
@@ -114,6 +272,10 @@ class GameState:
             "players": {side.value: name for side, name in self.player_names.items()},
             "current_player": self.current_player.value,
             "winner": self.winner.value if self.winner else None,
+            "draw_reason": self.draw_reason.value if self.draw_reason else None,
+            "repetition_limit": self.repetition_limit,
+            "no_capture_limit": self.no_capture_limit,
+            "plies_since_capture": self.plies_since_capture,
             "undo_remaining": {side.value: count for side, count in self.undo_remaining.items()},
             "pieces": [
                 {
@@ -146,6 +308,14 @@ class GameState:
         state.undo_remaining = {PlayerSide(
             side): count for side, count in payload["undo_remaining"].items()}
         state._move_log = [Move(**entry) for entry in payload.get("moves", [])]
+        state.draw_reason = DrawReason(
+            payload["draw_reason"]) if payload.get("draw_reason") else None
+        state.repetition_limit = payload.get("repetition_limit")
+        state.no_capture_limit = payload.get("no_capture_limit")
+        state.plies_since_capture = payload.get("plies_since_capture", 0)
+        # Saved games only keep the final position; repetitions start over.
+        state._reset_positions()
+        state._publish()
         return state
 
     @property
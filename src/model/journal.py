@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+from .board import InvalidMoveError
+from .enums import PlayerSide
+from .events import GameEvent, MoveApplied, MoveUndone, PlayerRenamed
+from .game_state import GameState
+from .position import Position
+from .serialization import SerializationError
+
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_COMPACT_EVERY = 200
+DEFAULT_BATCH_SIZE = 16
+
+
+class FsyncPolicy(str, Enum):
+    ALWAYS = "always"
+    BATCH = "batch"
+    NEVER = "never"
+
+
+class JournalError(SerializationError):
+    pass
+
+
+def journal_path_for(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name + JOURNAL_SUFFIX)
+
+
+def _encode(record: dict) -> bytes:
+    body = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return b"%08x " % zlib.crc32(body) + body + b"\n"
+
+
+def read_journal(path: Path) -> Tuple[List[dict], int]:
+    """Return the intact records of a journal and the byte length they cover.
+
+    Reading stops at the first record that is incomplete or fails its
+    checksum, which is how a record torn by a crash is discarded.
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return [], 0
+    records: List[dict] = []
+    offset = 0
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        if end < 0:
+            break
+        line = data[offset:end]
+        checksum, _, body = line.partition(b" ")
+        try:
+            valid = int(checksum, 16) == zlib.crc32(body)
+            record = json.loads(body) if valid else None
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            break
+        records.append(record)
+        offset = end + 1
+    return records, offset
+
+
+class MoveJournal:
+    """Write-ahead log of moves, undos and renames next to a ``.jungle`` snapshot.
+
+    Every change appends one small checksummed line to ``<snapshot>.journal``.
+    Every ``compact_every`` records the full game is written to the snapshot
+    and the journal starts over, so ``resume_game`` only replays a short tail.
+    If a write fails after attaching, the journal detaches itself and keeps
+    the failure in ``error``; the game carries on unjournaled.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        fsync: FsyncPolicy = FsyncPolicy.ALWAYS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        compact_every: Optional[int] = DEFAULT_COMPACT_EVERY,
+        start_seq: int = 0,
+    ) -> None:
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = journal_path_for(self.snapshot_path)
+        self.fsync = FsyncPolicy(fsync)
+        self.batch_size = max(1, batch_size)
+        self.compact_every = compact_every
+        self.seq = start_seq
+        self.state: Optional[GameState] = None
+        self.error: Optional[JournalError] = None
+        self._handle: Optional[BinaryIO] = None
+        self._since_compaction = 0
+        self._unsynced = 0
+
+    def attach(self, state: GameState) -> None:
+        if self.state is not None:
+            raise JournalError("Journal is already attached to a game.")
+        self.state = state
+        try:
+            self.compact()
+        except JournalError:
+            self.state = None
+            raise
+        state.events.add_listener(self._on_event)
+
+    def detach(self) -> None:
+        if self.state is not None:
+            self.state.events.remove_listener(self._on_event)
+            self.state = None
+        if self._handle is not None:
+            try:
+                self._sync()
+            finally:
+                self._handle.close()
+                self._handle = None
+
+    def compact(self) -> None:
+        """Write the full game to the snapshot and start an empty journal."""
+        if self.state is None:
+            raise JournalError("Journal is not attached to a game.")
+        payload = self.state.to_dict()
+        payload["saved_at"] = datetime.now(timezone.utc).isoformat()
+        payload["journal_seq"] = self.seq
+
+        # The snapshot records the last sequence number it contains, so a
+        # crash between replacing it and truncating the journal is harmless:
+        # resume skips records the snapshot already covers.
+        temporary = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            with open(temporary, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(payload, indent=2))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.snapshot_path)
+
+            # Truncate through the open handle rather than reopening the file,
+            # so a failure here never leaves an attached journal without one.
+            if self._handle is None:
+                self._handle = open(self.journal_path, "wb")
+            else:
+                self._handle.seek(0)
+                self._handle.truncate()
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+        except OSError as exc:
+            raise JournalError(f"Could not write snapshot {self.snapshot_path}: {exc}") from exc
+        self._since_compaction = 0
+        self._unsynced = 0
+
+    def _on_event(self, event: GameEvent) -> None:
+        if isinstance(event, MoveApplied):
+            record = {"op": "move", "src": event.source, "dst": event.target}
+        elif isinstance(event, MoveUndone):
+            record = {"op": "undo", "by": event.requester.value}
+        elif isinstance(event, PlayerRenamed):
+            record = {"op": "rename", "side": event.side.value, "name": event.name}
+        else:
+            return
+        try:
+            self._append(record)
+            if self.compact_every and self._since_compaction >= self.compact_every:
+                self.compact()
+        except JournalError as exc:
+            # The game has already applied the change, so raising would make it
+            # look rejected.  Stop journaling and leave the error in ``error``.
+            self._fail(exc)
+
+    def _fail(self, error: JournalError) -> None:
+        self.error = error
+        if self.state is not None:
+            self.state.events.remove_listener(self._on_event)
+            self.state = None
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+
+    def _append(self, record: dict) -> None:
+        assert self._handle is not None
+        self.seq += 1
+        record["n"] = self.seq
+        try:
+            self._handle.write(_encode(record))
+            self._handle.flush()
+        except OSError as exc:
+            raise JournalError(f"Could not write to journal {self.journal_path}: {exc}") from exc
+        self._since_compaction += 1
+        self._unsynced += 1
+        if self.fsync is FsyncPolicy.ALWAYS or (
+                self.fsync is FsyncPolicy.BATCH and self._unsynced >= self.batch_size):
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._handle is not None and self._unsynced and self.fsync is not FsyncPolicy.NEVER:
+            try:
+                os.fsync(self._handle.fileno())
+            except OSError as exc:
+                raise JournalError(f"Could not sync journal {self.journal_path}: {exc}") from exc
+        self._unsynced = 0
+
+
+def resume_game(snapshot_path: Path) -> Tuple[GameState, int]:
+    """Rebuild a journaled game from its snapshot plus the journal tail.
+
+    Returns the game and the last journal sequence number applied, which a new
+    ``MoveJournal`` should continue from.
+    """
+    snapshot_path = Path(snapshot_path)
+    try:
+        data = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except FileNotFoundError as exc:
+        raise JournalError(f"File not found: {snapshot_path}") from exc
+    except json.JSONDecodeError as exc:
+        raise JournalError("Snapshot is not valid JSON.") from exc
+
+    state = _rebuild_with_history(GameState.from_dict(data))
+    seq = int(data.get("journal_seq", 0))
+    records, _ = read_journal(journal_path_for(snapshot_path))
+    for record in records:
+        if record.get("n", 0) <= seq:
+            continue
+        try:
+            _apply(state, record)
+        except (InvalidMoveError, KeyError, ValueError) as exc:
+            raise JournalError(
+                f"Journal record {record.get('n')} cannot be replayed: {exc}") from exc
+        seq = record["n"]
+    return state, seq
+
+
+def _apply(state: GameState, record: dict) -> None:
+    op = record["op"]
+    if op == "move":
+        state.move(Position.from_notation(record["src"]),
+                   Position.from_notation(record["dst"]))
+    elif op == "undo":
+        state.undo(PlayerSide(record["by"]))
+    elif op == "rename":
+        state.rename_player(PlayerSide(record["side"]), record["name"])
+    else:
+        raise ValueError(f"unknown operation '{op}'")
+
+
+def _rebuild_with_history(saved: GameState) -> GameState:
+    # Snapshots carry no undo history. Replaying the move log from the initial
+    # position restores it, so undos journaled after a compaction still work.
+    replay = GameState.new(saved.player_names[PlayerSide.BLUE],
+                           saved.player_names[PlayerSide.RED])
+    replay.repetition_limit = saved.repetition_limit
+    replay.no_capture_limit = saved.no_capture_limit
+    for move in saved.move_log:
+        source = Position.from_notation(move.source)
+        target = Position.from_notation(move.target)
+        if not replay.board.is_legal(replay.current_player, source, target) or replay.is_over:
+            return saved
+        replay.move(source, target)
+    if (set(replay.board.iter_pieces()) != set(saved.board.iter_pieces())
+            or replay.current_player is not saved.current_player
+            or replay.winner is not saved.winner
+            or replay.draw_reason is not saved.draw_reason):
+        return saved
+    replay.undo_remaining = dict(saved.undo_remaining)
+    replay._move_log = saved.move_log
+    replay._publish()
+    return replay
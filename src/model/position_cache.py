@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Tuple, TypeVar
+
+from .board import Board
+from .enums import PlayerSide
+from .position import Position
+
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+LEGAL_MOVES = "legal-moves"
+
+T = TypeVar("T")
+MoveChoice = Tuple[Position, Position]
+
+# Sizes used to charge entries against the cap. Positions are small frozen
+# dataclasses; a move is a 2-tuple of them.
+_ENTRY_OVERHEAD = 200
+_MOVE_BYTES = sys.getsizeof((None, None)) + 2 * 56 + 16
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self) -> str:
+        return (f"{self.entries} entries, {self.bytes / 1024:.1f} of "
+                f"{self.max_bytes / 1024:.0f} KiB; hits {self.hits}, misses {self.misses} "
+                f"({self.hit_rate:.0%} hit rate), evictions {self.evictions}")
+
+
+class PositionCache:
+    """LRU cache of per-position results, bounded by an approximate byte size.
+
+    Entries are keyed by the board's Zobrist hash for the side to move (see
+    ``Board.position_hash``) and a result kind, so legal-move lists and any
+    analysis (solver results, evaluations) share one budget.  Callers get
+    back exactly what the computation returned the first time; move lists
+    are stored as tuples and copied out so they cannot be mutated in place.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("Cache size may not be negative.")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[int, Hashable], Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions,
+                          len(self._entries), self._bytes, self.max_bytes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    def resize(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise ValueError("Cache size may not be negative.")
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def legal_moves(self, board: Board, side: PlayerSide) -> List[MoveChoice]:
+        moves = self.analysis(board, side, LEGAL_MOVES,
+                              lambda: tuple(board.legal_moves(side)),
+                              size=lambda moves: _ENTRY_OVERHEAD + _MOVE_BYTES * len(moves))
+        return list(moves)
+
+    def analysis(
+        self,
+        board: Board,
+        side: PlayerSide,
+        kind: Hashable,
+        compute: Callable[[], T],
+        size: Optional[Callable[[T], int]] = None,
+    ) -> T:
+        """Return the cached ``kind`` result for this position, computing it on a miss."""
+        key = (board.position_hash(side), kind)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]  # type: ignore[return-value]
+        self.misses += 1
+        value = compute()
+        cost = size(value) if size else _ENTRY_OVERHEAD + sys.getsizeof(value)
+        if cost <= self.max_bytes:
+            self._entries[key] = (value, cost)
+            self._bytes += cost
+            self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self._bytes -= cost
+            self.evictions += 1
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .enums import PlayerSide
+from .game_state import GameState
+from .move import Move
+from .serialization import GameRecord, SerializationError, load_record, record_from_state
+
+# File layout: header, move table (compact JSON), node table, game table and
+# the metadata blob.  Nodes are stored in depth-first preorder, so a node's
+# subtree is the contiguous range ``[index, subtree_end)`` and the games
+# under a prefix are a contiguous slice of the game table, which is sorted by
+# node.  Readers mmap the file and decode nodes and metadata on demand.
+TRIE_MAGIC = b"JGT1"
+_HEADER = struct.Struct("<4sIII")  # magic, move table length, node count, game count
+_NODE = struct.Struct("<III")  # parent, move id, subtree end
+_GAME = struct.Struct("<III")  # end node, metadata offset, metadata length
+
+ROOT = 0
+_NO_MOVE = 0xFFFFFFFF
+
+# A move without its player name; the name comes from the game's metadata.
+MoveKey = Tuple[str, str, str, Optional[str]]
+MoveChoice = Tuple[str, str]
+
+
+class RecordTrieError(SerializationError):
+    pass
+
+
+def _owner(move: Move) -> Optional[PlayerSide]:
+    side = move.piece.split(" ", 1)[0]
+    return PlayerSide(side) if side in PlayerSide.__members__ else None
+
+
+class RecordTrieBuilder:
+    """Collects game records into a move trie and writes it with ``save``.
+
+    Identical opening sequences share one path of nodes, so each distinct
+    move in each distinct position is stored once however many games use it.
+    """
+
+    def __init__(self) -> None:
+        self._move_ids: Dict[MoveKey, int] = {}
+        self._move_keys: List[MoveKey] = []
+        self._children: List[Dict[int, int]] = [{}]
+        self._games: List[Tuple[int, dict]] = []
+        self.move_count = 0
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._children)
+
+    def add(self, record: GameRecord) -> None:
+        node = ROOT
+        renamed: Dict[str, str] = {}
+        for ply, move in enumerate(record.moves):
+            key: MoveKey = (move.source, move.target, move.piece, move.capture)
+            move_id = self._move_ids.get(key)
+            if move_id is None:
+                move_id = self._move_ids[key] = len(self._move_keys)
+                self._move_keys.append(key)
+            child = self._children[node].get(move_id)
+            if child is None:
+                child = self._children[node][move_id] = len(self._children)
+                self._children.append({})
+            node = child
+            owner = _owner(move)
+            if owner is None or record.players.get(owner) != move.player:
+                # Moves played under another name (e.g. before a rename).
+                renamed[str(ply)] = move.player
+        metadata = {
+            "players": {side.value: name for side, name in record.players.items()},
+            "winner": record.winner,
+            "created_at": record.created_at,
+        }
+        if renamed:
+            metadata["renamed"] = renamed
+        self._games.append((node, metadata))
+        self.move_count += len(record.moves)
+
+    def add_state(self, state: GameState) -> None:
+        self.add(record_from_state(state))
+
+    def import_records(self, sources: Iterable[Path]) -> int:
+        count = 0
+        for source in sources:
+            self.add(load_record(Path(source)))
+            count += 1
+        return count
+
+    def save(self, destination: Path) -> int:
+        """Write the trie to ``destination`` and return its size in bytes."""
+        order, parents, moves, ends = self._preorder()
+        new_index = {old: new for new, old in enumerate(order)}
+
+        nodes = bytearray(_NODE.size * len(order))
+        for new, old in enumerate(order):
+            _NODE.pack_into(nodes, new * _NODE.size,
+                            new_index[parents[old]] if old != ROOT else ROOT,
+                            moves[old], ends[old])
+
+        games = sorted(((new_index[node], metadata) for node, metadata in self._games),
+                       key=lambda game: game[0])
+        table = bytearray(_GAME.size * len(games))
+        blob = bytearray()
+        for index, (node, metadata) in enumerate(games):
+            encoded = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+            _GAME.pack_into(table, index * _GAME.size, node, len(blob), len(encoded))
+            blob += encoded
+
+        move_table = json.dumps(
+            [list(key) for key in self._move_keys], separators=(",", ":")).encode("utf-8")
+        header = _HEADER.pack(TRIE_MAGIC, len(move_table), len(order), len(games))
+        payload = b"".join((header, move_table, nodes, table, blob))
+        Path(destination).write_bytes(payload)
+        return len(payload)
+
+    def _preorder(self) -> Tuple[List[int], Dict[int, int], Dict[int, int], Dict[int, int]]:
+        # Iterative so that long games cannot hit the recursion limit.
+        order: List[int] = []
+        parents: Dict[int, int] = {ROOT: ROOT}
+        moves: Dict[int, int] = {ROOT: _NO_MOVE}
+        ends: Dict[int, int] = {}
+        stack: List[Tuple[int, bool]] = [(ROOT, False)]
+        while stack:
+            node, finished = stack.pop()
+            if finished:
+                ends[node] = len(order)
+                continue
+            order.append(node)
+            stack.append((node, True))
+            for move_id, child in sorted(self._children[node].items(), reverse=True):
+                parents[child] = node
+                moves[child] = move_id
+                stack.append((child, False))
+        return order, parents, moves, ends
+
+
+class RecordTrie:
+    """Read-only view of a saved move trie; nothing is decoded until asked for.
+
+    Games are numbered ``0 .. len(trie) - 1`` in trie order, so games that
+    share an opening are numbered consecutively.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        try:
+            self._file: BinaryIO = open(self.path, "rb")
+        except FileNotFoundError as exc:
+            raise RecordTrieError(f"File not found: {self.path}") from exc
+        try:
+            self._view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._file.close()
+            raise RecordTrieError(f"{self.path} is not a move trie.") from exc
+        try:
+            self._read_header()
+        except RecordTrieError:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise RecordTrieError(f"{self.path} is not a move trie.")
+        magic, move_bytes, self.node_count, self._game_count = _HEADER.unpack_from(self._view)
+        if magic != TRIE_MAGIC:
+            raise RecordTrieError(f"{self.path} is not a move trie.")
+        offset = _HEADER.size
+        try:
+            keys = json.loads(self._view[offset:offset + move_bytes])
+        except ValueError as exc:
+            raise RecordTrieError("Move table is corrupted.") from exc
+        self._move_keys: List[MoveKey] = [tuple(key) for key in keys]  # type: ignore[misc]
+        self._nodes_at = offset + move_bytes
+        self._games_at = self._nodes_at + self.node_count * _NODE.size
+        self._blob_at = self._games_at + self._game_count * _GAME.size
+        if len(self._view) < self._blob_at:
+            raise RecordTrieError("Move trie is truncated.")
+
+    # Context management ------------------------------------------------------
+
+    def __enter__(self) -> "RecordTrie":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._view.close()
+        self._file.close()
+
+    # Queries -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._game_count
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for index in range(self._game_count):
+            yield self.record(index)
+
+    def moves(self, index: int) -> Iterator[Move]:
+        """Yield the moves of game ``index`` in the order they were played."""
+        node, metadata = self._game(index)
+        path: List[int] = []
+        while node != ROOT:
+            parent, move_id, _ = self._node(node)
+            path.append(move_id)
+            node = parent
+        players = {PlayerSide(side): name for side, name in metadata["players"].items()}
+        renamed = metadata.get("renamed", {})
+        for ply, move_id in enumerate(reversed(path)):
+            source, target, piece, capture = self._move_keys[move_id]
+            player = renamed.get(str(ply))
+            if player is None:
+                player = players[PlayerSide(piece.split(" ", 1)[0])]
+            yield Move(player=player, piece=piece, source=source, target=target, capture=capture)
+
+    def record(self, index: int) -> GameRecord:
+        _, metadata = self._game(index)
+        return GameRecord(
+            players={PlayerSide(side): name for side, name in metadata["players"].items()},
+            moves=list(self.moves(index)),
+            winner=metadata.get("winner"),
+            created_at=metadata.get("created_at", ""),
+        )
+
+    def games_with_prefix(self, prefix: Sequence[MoveChoice]) -> range:
+        """Indices of the games whose first moves are ``prefix`` (notation pairs)."""
+        node = ROOT
+        for source, target in prefix:
+            node = self._child(node, source, target)
+            if node is None:
+                return range(0)
+        end = self._node(node)[2]
+        return range(self._first_game_at(node), self._first_game_at(end))
+
+    def continuations(self, prefix: Sequence[MoveChoice]) -> Dict[MoveChoice, int]:
+        """Moves played after ``prefix`` and how many games chose each."""
+        node = ROOT
+        for source, target in prefix:
+            node = self._child(node, source, target)
+            if node is None:
+                return {}
+        counts: Dict[MoveChoice, int] = {}
+        for child in self._children(node):
+            source, target = self._move_keys[self._node(child)[1]][:2]
+            end = self._node(child)[2]
+            counts[source, target] = self._first_game_at(end) - self._first_game_at(child)
+        return counts
+
+    # Internal helpers --------------------------------------------------------
+
+    def _node(self, index: int) -> Tuple[int, int, int]:
+        if not 0 <= index < self.node_count:
+            raise RecordTrieError(f"Node {index} is out of range.")
+        return _NODE.unpack_from(self._view, self._nodes_at + index * _NODE.size)
+
+    def _children(self, node: int) -> Iterator[int]:
+        end = self._node(node)[2]
+        child = node + 1
+        while child < end:
+            yield child
+            child = self._node(child)[2]
+
+    def _child(self, node: int, source: str, target: str) -> Optional[int]:
+        for child in self._children(node):
+            key = self._move_keys[self._node(child)[1]]
+            if key[0] == source and key[1] == target:
+                return child
+        return None
+
+    def _game(self, index: int) -> Tuple[int, dict]:
+        if not 0 <= index < self._game_count:
+            raise IndexError(f"Game {index} is out of range.")
+        node, offset, length = _GAME.unpack_from(self._view, self._games_at + index * _GAME.size)
+        start = self._blob_at + offset
+        try:
+            metadata = json.loads(self._view[start:start + length])
+        except ValueError as exc:
+            raise RecordTrieError(f"Metadata of game {index} is corrupted.") from exc
+        return node, metadata
+
+    def _first_game_at(self, node: int) -> int:
+        """Index of the first game whose end node is ``node`` or later."""
+        low, high = 0, self._game_count
+        while low < high:
+            middle = (low + high) // 2
+            game_node = _GAME.unpack_from(self._view, self._games_at + middle * _GAME.size)[0]
+            if game_node < node:
+                low = middle + 1
+            else:
+                high = middle
+        return low
@@ -39,14 +39,38 @@ def load_game(source: Path) -> GameState:
     return GameState.from_dict(data)
 
 
-def export_record(state: GameState, destination: Path) -> None:
-    payload = {
-        "players": {side.value: name for side, name in state.player_names.items()},
-        "winner": state.winner.value if state.winner else None,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "moves": [move.__dict__ for move in state.move_log],
+def record_from_state(state: GameState) -> GameRecord:
+    return GameRecord(
+        players=dict(state.player_names),
+        moves=state.move_log,
+        winner=state.winner.value if state.winner else None,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def record_to_dict(record: GameRecord) -> dict:
+    return {
+        "players": {side.value: name for side, name in record.players.items()},
+        "winner": record.winner,
+        "created_at": record.created_at,
+        "moves": [move.__dict__ for move in record.moves],
     }
-    destination.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def record_from_dict(data: dict) -> GameRecord:
+    moves = [Move(**entry) for entry in data.get("moves", [])]
+    players = {PlayerSide(side): name for side,
+               name in data.get("players", {}).items()}
+    return GameRecord(players=players, moves=moves, winner=data.get("winner"), created_at=data.get("created_at", ""))
+
+
+def export_record(state: GameState, destination: Path) -> None:
+    write_record(record_from_state(state), destination)
+
+
+def write_record(record: GameRecord, destination: Path) -> None:
+    destination.write_text(json.dumps(
+        record_to_dict(record), indent=2), encoding="utf-8")
 
 
 def load_record(source: Path) -> GameRecord:
@@ -56,8 +80,4 @@ def load_record(source: Path) -> GameRecord:
         raise SerializationError(f"File not found: {source}") from exc
     except json.JSONDecodeError as exc:
         raise SerializationError("Record file contains invalid JSON.") from exc
-
-    moves = [Move(**entry) for entry in data.get("moves", [])]
-    players = {PlayerSide(side): name for side,
-               name in data.get("players", {}).items()}
-    return GameRecord(players=players, moves=moves, winner=data.get("winner"), created_at=data.get("created_at", ""))
+    return record_from_dict(data)
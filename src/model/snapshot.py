@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .board import Board, PositionKey
+from .enums import DrawReason, PlayerSide, SquareType
+from .piece import Piece
+from .position import BOARD_HEIGHT, BOARD_WIDTH, Position, in_bounds
+
+Row = Tuple[Optional[Piece], ...]
+
+_EMPTY_ROW: Row = (None,) * BOARD_WIDTH
+
+
+@dataclass(frozen=True)
+class BoardVersion:
+    """Immutable board; new versions share every row they do not change.
+
+    Exposes the read-only part of the ``Board`` interface so renderers and
+    analysis code can use a version wherever they would read a board.
+    """
+
+    rows: Tuple[Row, ...] = (_EMPTY_ROW,) * BOARD_HEIGHT
+
+    @staticmethod
+    def from_board(board: Board) -> "BoardVersion":
+        rows: List[List[Optional[Piece]]] = [
+            [None] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)]
+        for piece in board.iter_pieces():
+            rows[piece.position.row][piece.position.col] = piece
+        return BoardVersion(rows=tuple(tuple(row) for row in rows))
+
+    def with_changes(self, changes: Iterable[Tuple[PositionKey, Optional[Piece]]]) -> "BoardVersion":
+        touched: Dict[int, List[Optional[Piece]]] = {}
+        for (row, col), piece in changes:
+            cells = touched.get(row)
+            if cells is None:
+                cells = touched[row] = list(self.rows[row])
+            cells[col] = piece
+        if not touched:
+            return self
+        rows = list(self.rows)
+        for row, cells in touched.items():
+            rows[row] = tuple(cells)
+        return BoardVersion(rows=tuple(rows))
+
+    def piece_at(self, position: Position) -> Optional[Piece]:
+        if not in_bounds(position.row, position.col):
+            return None
+        return self.rows[position.row][position.col]
+
+    def iter_pieces(self) -> Iterator[Piece]:
+        for row in self.rows:
+            for piece in row:
+                if piece is not None:
+                    yield piece
+
+    def square_type(self, position: Position) -> SquareType:
+        return _SQUARE_PROBE.square_type(position)
+
+    def to_board(self) -> Board:
+        board = Board()
+        for piece in self.iter_pieces():
+            board._place_piece(piece)
+        return board
+
+
+_SQUARE_PROBE = Board()
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """Consistent view of a game published by ``GameState`` after each change."""
+
+    version: int
+    board: BoardVersion
+    current_player: PlayerSide
+    winner: Optional[PlayerSide]
+    move_count: int
+    player_names: Tuple[Tuple[PlayerSide, str], ...]
+    draw_reason: Optional[DrawReason] = None
+
+    def player_name(self, side: PlayerSide) -> str:
+        return dict(self.player_names)[side]
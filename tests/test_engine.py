@@ -0,0 +1,151 @@
+import importlib.util
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.cli.verify import verify_file
+from src.engine.players import PlayerConfig, choose_move
+from src.engine.solver import SolveStatus, solve, solve_files
+from src.engine.tournament import SprtSettings, play_game, run_tournament, sprt_llr
+from src.model.board import Board
+from src.model.enums import PieceType, PlayerSide
+from src.model.game_state import GameState
+from src.model.piece import Piece
+from src.model.position import Position
+from src.model.serialization import save_game
+
+
+class PlayerTest(unittest.TestCase):
+    def test_parse_player_spec(self) -> None:
+        config = PlayerConfig.parse("search:depth=3,weights=tuned.json")
+        self.assertEqual(3, config.depth)
+        self.assertEqual("tuned.json", config.weights)
+        with self.assertRaises(ValueError):
+            PlayerConfig.parse("search:speed=3")
+        with self.assertRaises(ValueError):
+            PlayerConfig.parse("oracle")
+
+    def test_search_takes_den_when_available(self) -> None:
+        board = Board()
+        board._place_piece(Piece(PieceType.DOG, PlayerSide.BLUE, Position(7, 3)))
+        board._place_piece(Piece(PieceType.DOG, PlayerSide.RED, Position(4, 0)))
+        state = GameState(board=board)
+        choice = choose_move(state, PlayerConfig(depth=2), random.Random(0))
+        self.assertEqual((Position(7, 3), Position(8, 3)), choice)
+
+
+class SolverTest(unittest.TestCase):
+    def _dog_race(self) -> GameState:
+        board = Board()
+        board._place_piece(Piece(PieceType.DOG, PlayerSide.BLUE, Position(5, 3)))
+        board._place_piece(Piece(PieceType.CAT, PlayerSide.RED, Position(8, 0)))
+        return GameState(board=board)
+
+    def test_proves_den_entry(self) -> None:
+        result = solve(self._dog_race())
+        self.assertIs(SolveStatus.PROVEN, result.status)
+        self.assertEqual(5, result.plies)
+        self.assertEqual(5, len(result.principal_variation))
+        self.assertEqual((Position(7, 3), Position(8, 3)), result.principal_variation[-1])
+
+    def test_ply_limit_disproves(self) -> None:
+        result = solve(self._dog_race(), max_plies=3)
+        self.assertIs(SolveStatus.DISPROVEN, result.status)
+
+    def test_node_limit_leaves_result_unknown(self) -> None:
+        result = solve(GameState.new(), max_nodes=50)
+        self.assertIs(SolveStatus.UNKNOWN, result.status)
+
+    def test_solves_saved_games(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "race.jungle"
+            save_game(self._dog_race(), path)
+            [(solved_path, result)] = solve_files([path])
+        self.assertEqual(path, solved_path)
+        self.assertIs(SolveStatus.PROVEN, result.status)
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+class VectorEnvTest(unittest.TestCase):
+    def test_matches_game_state_on_random_games(self) -> None:
+        import numpy as np
+        from src.engine.vector_env import RED, BLUE, NO_WINNER, VectorJungleEnv, move_to_action
+
+        sides = {BLUE: PlayerSide.BLUE, RED: PlayerSide.RED, NO_WINNER: None}
+        rng = random.Random(11)
+        env = VectorJungleEnv(4, max_plies=150)
+        states = [GameState.new() for _ in range(env.num_games)]
+        finished = 0
+        while finished < 12:
+            mask = env.legal_action_mask()
+            actions = []
+            for index, state in enumerate(states):
+                expected = {move_to_action(src, dst) for src, dst in state.legal_moves()}
+                self.assertEqual(expected, set(np.flatnonzero(mask[index]).tolist()))
+                action = rng.choice(sorted(expected))
+                self.assertIn(env.action_to_move(index, action), state.legal_moves())
+                state.move(*env.action_to_move(index, action))
+                actions.append(action)
+            result = env.step(np.array(actions))
+            for index, state in enumerate(states):
+                if not result.dones[index]:
+                    self.assertIsNone(state.winner)
+                    self.assertEqual(set(state.board.iter_pieces()),
+                                     set(env.board(index).iter_pieces()))
+                    continue
+                winner = state.winner
+                if winner is None and state.legal_moves():
+                    self.assertEqual(150, len(state.move_log))
+                elif winner is None:
+                    winner = state.current_player.opponent()
+                self.assertEqual(winner, sides[int(result.winners[index])])
+                self.assertEqual(set(Board.initial().iter_pieces()),
+                                 set(env.board(index).iter_pieces()))
+                states[index] = GameState.new()
+                finished += 1
+
+    def test_rejects_illegal_actions(self) -> None:
+        import numpy as np
+        from src.engine.vector_env import VectorJungleEnv
+
+        env = VectorJungleEnv(2)
+        with self.assertRaises(ValueError):
+            env.step(np.array([1, 1]))  # the a1 lion stepping off the board
+
+
+class TournamentTest(unittest.TestCase):
+    def test_llr_sign_follows_results(self) -> None:
+        self.assertGreater(sprt_llr([0, 0, 2, 10, 20], 0, 10), 0)
+        self.assertLess(sprt_llr([20, 10, 2, 0, 0], 0, 10), 0)
+
+    def test_pairs_are_recorded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_tournament(
+                PlayerConfig(kind="random"), PlayerConfig(kind="random"),
+                max_pairs=2, workers=1, record_dir=Path(tmp),
+                sprt=SprtSettings(), max_plies=20)
+            records = sorted(Path(tmp).glob("*.record"))
+            reports = [verify_file(path) for path in records]
+        self.assertEqual(2, report.pairs)
+        self.assertEqual(4, report.wins + report.draws + report.losses)
+        self.assertEqual(4, len(records))
+        self.assertEqual([], [report.errors for report in reports if not report.ok])
+
+    def test_side_without_moves_loses(self) -> None:
+        board = Board()
+        board._place_piece(Piece(PieceType.CAT, PlayerSide.RED, Position(0, 0)))
+        board._place_piece(Piece(PieceType.ELEPHANT, PlayerSide.BLUE, Position(0, 1)))
+        board._place_piece(Piece(PieceType.ELEPHANT, PlayerSide.BLUE, Position(1, 0)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "stuck.jungle"
+            save_game(GameState(board=board, current_player=PlayerSide.RED), path)
+            outcome = play_game(PlayerConfig(kind="random"), PlayerConfig(kind="random"),
+                                PlayerSide.BLUE, str(path), seed=1, max_plies=10,
+                                record_path=None)
+        self.assertIs(PlayerSide.BLUE, outcome.winner)
+        self.assertEqual(1.0, outcome.candidate_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,33 @@
+import io
+import json
+import os
+import random
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from src.model.board import Board, InvalidMoveError
-from src.model.enums import PieceType, PlayerSide
+from src.cli.verify import verify_file, verify_paths
+from src.model.archive import GameArchive
+from src.model.board import Board, InvalidMoveError, MoveCheck
+from src.model.enums import DrawReason, PieceType, PlayerSide, SquareType
+from src.model.evaluation import EvaluationWeights, Evaluator
+from src.model.events import (
+    BackpressurePolicy,
+    JsonLinesWriter,
+    MoveApplied,
+    MoveUndone,
+    PlayerRenamed,
+    SquareChange,
+    WinnerDecided,
+)
 from src.model.game_state import GameState, UNDO_LIMIT
+from src.model.journal import FsyncPolicy, JournalError, MoveJournal, read_journal, resume_game
 from src.model.piece import Piece
+from src.model.position_cache import PositionCache
+from src.model.record_trie import RecordTrie, RecordTrieBuilder
 from src.model.position import Position
-from src.model.serialization import load_game, save_game
+from src.model.serialization import export_record, load_game, load_record, save_game
 
 
 class BoardRulesTest(unittest.TestCase):
@@ -63,6 +83,101 @@ class BoardRulesTest(unittest.TestCase):
         board._place_piece(elephant)
         board.move(PlayerSide.BLUE, Position(1, 2), Position(1, 3))
 
+    def test_check_move_reports_reason_without_mutating(self) -> None:
+        board = Board.initial()
+        before = dict(board._pieces)
+        self.assertIs(MoveCheck.OK, board.check_move(
+            PlayerSide.BLUE, Position(2, 0), Position(3, 0)))
+        self.assertIs(MoveCheck.RIVER_FORBIDDEN, board.check_move(
+            PlayerSide.BLUE, Position(2, 2), Position(3, 2)))
+        self.assertIs(MoveCheck.NOT_OWN_PIECE, board.check_move(
+            PlayerSide.BLUE, Position(6, 0), Position(5, 0)))
+        self.assertEqual(before, board._pieces)
+
+    def test_check_moves_batch_and_error_messages(self) -> None:
+        board = Board.initial()
+        candidates = [(Position(2, 0), Position(3, 0)),
+                      (Position(4, 4), Position(4, 5)),
+                      (Position(0, 0), Position(0, 0))]
+        self.assertEqual([MoveCheck.OK, MoveCheck.NO_PIECE, MoveCheck.SAME_SQUARE],
+                         board.check_moves(PlayerSide.BLUE, candidates))
+        with self.assertRaises(InvalidMoveError) as ctx:
+            board.move(PlayerSide.BLUE, Position(2, 2), Position(3, 2))
+        self.assertEqual("Only rats may enter the river.", str(ctx.exception))
+        self.assertIs(MoveCheck.RIVER_FORBIDDEN, ctx.exception.code)
+
+
+def _capture_board(attacker: Piece, defender: Piece) -> Board:
+    board = Board()
+    board._place_piece(attacker)
+    board._place_piece(defender)
+    return board
+
+
+class CaptureTableTest(unittest.TestCase):
+    def _check(self, attacker: Piece, defender: Piece) -> MoveCheck:
+        board = _capture_board(attacker, defender)
+        return board.check_move(attacker.owner, attacker.position, defender.position)
+
+    def test_rat_and_elephant(self) -> None:
+        blue, red = PlayerSide.BLUE, PlayerSide.RED
+        board = _capture_board(Piece(PieceType.RAT, blue, Position(6, 0)),
+                               Piece(PieceType.ELEPHANT, red, Position(7, 0)))
+        moved, captured = board.move(blue, Position(6, 0), Position(7, 0))
+        self.assertEqual(Piece(PieceType.ELEPHANT, red, Position(7, 0)), captured)
+        self.assertEqual(moved, board.piece_at(Position(7, 0)))
+        self.assertIs(MoveCheck.RAT_CAPTURES_FROM_WATER, self._check(
+            Piece(PieceType.RAT, blue, Position(3, 1)), Piece(PieceType.ELEPHANT, red, Position(2, 1))))
+        self.assertIs(MoveCheck.ELEPHANT_CAPTURES_RAT, self._check(
+            Piece(PieceType.ELEPHANT, red, Position(7, 0)), Piece(PieceType.RAT, blue, Position(6, 0))))
+
+    def test_rats_in_and_out_of_water(self) -> None:
+        blue, red = PlayerSide.BLUE, PlayerSide.RED
+        self.assertIs(MoveCheck.OK, self._check(
+            Piece(PieceType.RAT, blue, Position(3, 1)), Piece(PieceType.RAT, red, Position(4, 1))))
+        self.assertIs(MoveCheck.OK, self._check(
+            Piece(PieceType.RAT, blue, Position(2, 0)), Piece(PieceType.RAT, red, Position(2, 1))))
+        self.assertIs(MoveCheck.RAT_ATTACKS_RAT_IN_WATER, self._check(
+            Piece(PieceType.RAT, blue, Position(2, 1)), Piece(PieceType.RAT, red, Position(3, 1))))
+        self.assertIs(MoveCheck.RAT_CAPTURES_FROM_WATER, self._check(
+            Piece(PieceType.RAT, red, Position(5, 4)), Piece(PieceType.RAT, blue, Position(6, 4))))
+        self.assertIs(MoveCheck.RANK_TOO_LOW, self._check(
+            Piece(PieceType.RAT, blue, Position(3, 1)), Piece(PieceType.CAT, red, Position(2, 1))))
+        with self.assertRaises(InvalidMoveError) as ctx:
+            _capture_board(Piece(PieceType.RAT, blue, Position(3, 1)),
+                           Piece(PieceType.ELEPHANT, red, Position(2, 1))).move(
+                blue, Position(3, 1), Position(2, 1))
+        self.assertEqual("A rat cannot capture an elephant or rat on land directly from water.",
+                         str(ctx.exception))
+
+    def test_traps_weaken_only_enemy_pieces(self) -> None:
+        blue, red = PlayerSide.BLUE, PlayerSide.RED
+        self.assertIs(MoveCheck.RANK_TOO_LOW, self._check(
+            Piece(PieceType.CAT, blue, Position(2, 0)), Piece(PieceType.LION, red, Position(2, 1))))
+        # A red lion in a BLUE trap loses its rank; a BLUE lion in its own trap keeps it.
+        self.assertIs(MoveCheck.OK, self._check(
+            Piece(PieceType.CAT, blue, Position(1, 2)), Piece(PieceType.LION, red, Position(1, 3))))
+        self.assertIs(MoveCheck.RANK_TOO_LOW, self._check(
+            Piece(PieceType.CAT, red, Position(1, 2)), Piece(PieceType.LION, blue, Position(1, 3))))
+        self.assertIs(MoveCheck.OK, self._check(
+            Piece(PieceType.CAT, red, Position(7, 2)), Piece(PieceType.ELEPHANT, blue, Position(7, 3))))
+        self.assertIs(MoveCheck.RANK_TOO_LOW, self._check(
+            Piece(PieceType.RAT, blue, Position(7, 2)), Piece(PieceType.TIGER, red, Position(7, 3))))
+
+    def test_jumps_capture_across_the_river(self) -> None:
+        blue, red = PlayerSide.BLUE, PlayerSide.RED
+        self.assertIs(MoveCheck.OK, self._check(
+            Piece(PieceType.LION, blue, Position(2, 1)), Piece(PieceType.TIGER, red, Position(6, 1))))
+        self.assertIs(MoveCheck.RANK_TOO_LOW, self._check(
+            Piece(PieceType.TIGER, blue, Position(2, 1)), Piece(PieceType.ELEPHANT, red, Position(6, 1))))
+
+    def test_square_types_are_tabulated(self) -> None:
+        board = Board()
+        self.assertIs(SquareType.DEN_RED, board.square_type(Position(8, 3)))
+        self.assertIs(SquareType.TRAP_BLUE, board.square_type(Position(1, 3)))
+        self.assertIs(SquareType.RIVER, board.square_type(Position(4, 5)))
+        self.assertIs(SquareType.LAND, board.square_type(Position(4, 3)))
+
 
 class GameStateTest(unittest.TestCase):
     def test_victory_by_den_entry(self) -> None:
@@ -97,6 +212,485 @@ class GameStateTest(unittest.TestCase):
         self.assertEqual(state.current_player, loaded.current_player)
         self.assertEqual(len(state.move_log), len(loaded.move_log))
 
+    def test_repetition_draw_and_undo_rollback(self) -> None:
+        state = GameState.new("Blue", "Red")
+        state.repetition_limit = 3
+        shuffle = [(Position(2, 0), Position(2, 1)), (Position(6, 6), Position(5, 6)),
+                   (Position(2, 1), Position(2, 0)), (Position(5, 6), Position(6, 6))]
+        for src, dst in shuffle * 2:
+            self.assertIsNone(state.draw_reason)
+            state.move(src, dst)
+        self.assertEqual(DrawReason.REPETITION, state.draw_reason)
+        self.assertEqual(3, state.repetitions())
+        self.assertEqual([], state.legal_moves())
+        with self.assertRaises(InvalidMoveError):
+            state.move(Position(2, 0), Position(2, 1))
+        state.undo(PlayerSide.RED)
+        self.assertIsNone(state.draw_reason)
+        self.assertEqual(2, state.repetitions())
+        state.move(Position(5, 6), Position(6, 6))
+        self.assertEqual(DrawReason.REPETITION, state.draw_reason)
+
+    def test_no_capture_limit_survives_save(self) -> None:
+        state = GameState.new("Blue", "Red")
+        state.no_capture_limit = 3
+        state.move(Position(2, 0), Position(2, 1))
+        state.move(Position(6, 6), Position(5, 6))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.jungle"
+            save_game(state, path)
+            loaded = load_game(path)
+        self.assertEqual((3, 2), (loaded.no_capture_limit, loaded.plies_since_capture))
+        loaded.move(Position(2, 1), Position(2, 0))
+        self.assertEqual(DrawReason.NO_CAPTURE, loaded.draw_reason)
+        self.assertIsNone(loaded.winner)
+
+    def test_position_hash_is_incremental(self) -> None:
+        state = _short_game()
+        rebuilt = Board()
+        for piece in state.board.iter_pieces():
+            rebuilt._place_piece(piece)
+        self.assertEqual(rebuilt.position_hash(PlayerSide.RED),
+                         state.board.position_hash(PlayerSide.RED))
+        self.assertNotEqual(rebuilt.position_hash(PlayerSide.BLUE),
+                            state.board.position_hash(PlayerSide.RED))
+
+
+def _short_game(blue: str = "Alpha", red: str = "Beta") -> GameState:
+    state = GameState.new(blue, red)
+    state.move(Position(2, 0), Position(2, 1))
+    state.move(Position(6, 6), Position(5, 6))
+    return state
+
+
+class GameArchiveTest(unittest.TestCase):
+    def test_append_lookup_and_iterate(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.jga"
+            with GameArchive(path, sync=False) as archive:
+                first = archive.append_state(_short_game("A", "B"))
+                second = archive.append_state(_short_game("C", "D"))
+            with GameArchive(path, writable=False) as archive:
+                self.assertEqual([first, second], archive.game_ids())
+                self.assertEqual("C", archive.get(second).players[PlayerSide.BLUE])
+                streamed = [record.players[PlayerSide.RED]
+                            for _, record in archive]
+        self.assertEqual(["B", "D"], streamed)
+
+    def test_truncated_tail_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.jga"
+            with GameArchive(path, sync=False) as archive:
+                kept = archive.append_state(_short_game())
+                archive.append_state(_short_game())
+            size = path.stat().st_size
+            with open(path, "r+b") as handle:
+                handle.truncate(size - 5)
+            index_path = archive.index_path
+            index_path.write_bytes(index_path.read_bytes()[:-3])
+            with GameArchive(path, sync=False) as archive:
+                self.assertEqual([kept], archive.game_ids())
+                added = archive.append_state(_short_game())
+            with GameArchive(path, writable=False) as archive:
+                self.assertEqual([kept, added], archive.game_ids())
+                self.assertEqual(2, len(archive.get(added).moves))
+
+    def test_missing_index_is_rebuilt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.jga"
+            with GameArchive(path, sync=False) as archive:
+                game_id = archive.append_state(_short_game())
+            archive.index_path.unlink()
+            with GameArchive(path, sync=False) as archive:
+                self.assertIn(game_id, archive)
+
+    def test_record_import_export_roundtrip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "game.record"
+            export_record(_short_game(), source)
+            with GameArchive(Path(tmp) / "games.jga", sync=False) as archive:
+                [game_id] = archive.import_records([source])
+                [exported] = archive.export_records(Path(tmp) / "out")
+            self.assertEqual(f"{game_id}.record", exported.name)
+            self.assertEqual(load_record(source), load_record(exported))
+
+
+class VerifyTest(unittest.TestCase):
+    def test_consistent_files_pass(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            save_game(_short_game(), Path(tmp) / "game.jungle")
+            export_record(_short_game(), Path(tmp) / "nested.record")
+            reports = []
+            summary = verify_paths([Path(tmp)], workers=1, on_report=reports.append)
+        self.assertEqual((2, 0), (summary.checked, summary.failed))
+        self.assertTrue(all(report.moves == 2 for report in reports))
+
+    def test_tampered_files_are_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            game_path = Path(tmp) / "game.jungle"
+            save_game(_short_game(), game_path)
+            data = json.loads(game_path.read_text(encoding="utf-8"))
+            data["pieces"][0]["row"] += 1
+            data["winner"] = "RED"
+            game_path.write_text(json.dumps(data), encoding="utf-8")
+            game_report = verify_file(game_path)
+
+            record_path = Path(tmp) / "game.record"
+            export_record(_short_game(), record_path)
+            data = json.loads(record_path.read_text(encoding="utf-8"))
+            data["moves"][1]["target"] = "g3"
+            record_path.write_text(json.dumps(data), encoding="utf-8")
+            record_report = verify_file(record_path)
+
+            broken = Path(tmp) / "broken.jungle"
+            broken.write_text("{", encoding="utf-8")
+            broken_report = verify_file(broken)
+        self.assertEqual(2, len(game_report.errors))
+        self.assertIn("stored board differs", game_report.errors[0])
+        self.assertIn("move 2", record_report.errors[0])
+        self.assertIn("invalid JSON", broken_report.errors[0])
+
+    def test_renamed_players_pass(self) -> None:
+        state = _short_game()
+        state.rename_player(PlayerSide.BLUE, "Carol")
+        state.move(Position(2, 1), Position(2, 0))
+        with tempfile.TemporaryDirectory() as tmp:
+            save_game(state, Path(tmp) / "game.jungle")
+            export_record(state, Path(tmp) / "game.record")
+            summary = verify_paths([Path(tmp)], workers=1)
+        self.assertEqual((2, 0), (summary.checked, summary.failed))
+
+
+class RecordTrieTest(unittest.TestCase):
+    def test_games_roundtrip_and_share_prefixes(self) -> None:
+        first = _short_game("A", "B")
+        first.move(Position(2, 1), Position(2, 0))
+        second = _short_game("C", "D")
+        second.rename_player(PlayerSide.BLUE, "Carol")
+        second.move(Position(2, 1), Position(3, 1))
+        builder = RecordTrieBuilder()
+        builder.add_state(first)
+        builder.add_state(second)
+        builder.add_state(GameState.new("E", "F"))
+        self.assertEqual(5, builder.node_count)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.trie"
+            builder.save(path)
+            with RecordTrie(path) as trie:
+                stored = {record.players[PlayerSide.RED]: record for record in trie}
+                self.assertEqual(first.move_log, stored["B"].moves)
+                self.assertEqual(second.move_log, stored["D"].moves)
+                self.assertEqual([], stored["F"].moves)
+                opening = [("a3", "b3"), ("g7", "g6")]
+                self.assertEqual(2, len(trie.games_with_prefix(opening)))
+                self.assertEqual({("b3", "a3"): 1, ("b3", "b4"): 1},
+                                 trie.continuations(opening))
+                [index] = trie.games_with_prefix(opening + [("b3", "b4")])
+                self.assertEqual("D", trie.record(index).players[PlayerSide.RED])
+                self.assertEqual(range(0), trie.games_with_prefix([("a1", "a2")]))
+
+
+class PositionCacheTest(unittest.TestCase):
+    def test_cached_moves_match_fresh_generation(self) -> None:
+        cache = PositionCache()
+        state = GameState.new()
+        state.cache = cache
+        rng = random.Random(4)
+        for _ in range(40):
+            moves = state.legal_moves()
+            self.assertEqual(state.board.legal_moves(state.current_player), moves)
+            state.move(*rng.choice(moves))
+        for _ in range(UNDO_LIMIT):
+            state.undo(PlayerSide.BLUE)
+            hits = cache.hits
+            self.assertEqual(state.board.legal_moves(state.current_player), state.legal_moves())
+            self.assertEqual(hits + 1, cache.hits)
+
+        # The same position reached by two move orders shares one entry.
+        first, second = GameState.new(), GameState.new()
+        first.cache = second.cache = cache
+        for state, line in ((first, [(2, 0, 2, 1), (6, 6, 5, 6), (1, 1, 1, 2), (6, 0, 5, 0)]),
+                            (second, [(1, 1, 1, 2), (6, 0, 5, 0), (2, 0, 2, 1), (6, 6, 5, 6)])):
+            for row, col, to_row, to_col in line:
+                state.move(Position(row, col), Position(to_row, to_col))
+        first.legal_moves()
+        hits = cache.hits
+        self.assertEqual(second.board.legal_moves(PlayerSide.BLUE), second.legal_moves())
+        self.assertEqual(hits + 1, cache.hits)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = PositionCache(max_bytes=1000)
+        board = Board.initial()
+        calls = []
+
+        def analyse(side: PlayerSide) -> str:
+            return cache.analysis(board, side, "label", lambda: calls.append(side) or side.name,
+                                  size=lambda _: 400)
+
+        analyse(PlayerSide.BLUE)
+        analyse(PlayerSide.RED)
+        analyse(PlayerSide.BLUE)
+        board.move(PlayerSide.BLUE, Position(2, 0), Position(2, 1))
+        analyse(PlayerSide.RED)
+        stats = cache.stats()
+        self.assertEqual((1, 3, 1, 2), (stats.hits, stats.misses, stats.evictions, stats.entries))
+        self.assertLessEqual(stats.bytes, 1000)
+        board.move(PlayerSide.BLUE, Position(2, 1), Position(2, 0))
+        self.assertEqual("BLUE", analyse(PlayerSide.BLUE))
+        self.assertEqual(3, len(calls))
+
+
+class DistanceTableTest(unittest.TestCase):
+    def test_distances_follow_river_rules(self) -> None:
+        board = Board()
+        dog = Piece(PieceType.DOG, PlayerSide.BLUE, Position(2, 1))
+        rat = Piece(PieceType.RAT, PlayerSide.BLUE, Position(2, 1))
+        lion = Piece(PieceType.LION, PlayerSide.BLUE, Position(2, 1))
+        self.assertEqual(8, board.distance_to_den(dog))
+        self.assertEqual(8, board.distance_to_den(rat))
+        self.assertEqual(5, board.distance_to_den(lion))
+        self.assertIsNone(board.distance_to_den(dog, PlayerSide.BLUE))
+        self.assertEqual(3, board.distance_to_trap(dog, Position(1, 3)))
+        with self.assertRaises(ValueError):
+            board.distance_to_trap(dog, Position(4, 3))
+
+    def test_rat_in_lane_blocks_jump_distance(self) -> None:
+        board = Board()
+        lion = Piece(PieceType.LION, PlayerSide.BLUE, Position(2, 1))
+        board._place_piece(lion)
+        board._place_piece(Piece(PieceType.RAT, PlayerSide.RED, Position(4, 1)))
+        board._place_piece(Piece(PieceType.RAT, PlayerSide.RED, Position(4, 2)))
+        self.assertEqual(7, board.distance_to_den(lion))
+        board.move(PlayerSide.RED, Position(4, 2), Position(4, 3))
+        self.assertEqual(5, board.distance_to_den(lion))
+        board.move(PlayerSide.RED, Position(4, 1), Position(4, 0))
+        self.assertEqual(0, board.river_mask)
+
+
+class SnapshotTest(unittest.TestCase):
+    def test_versions_share_unchanged_rows(self) -> None:
+        state = GameState.new("Blue", "Red")
+        before = state.snapshot()
+        state.move(Position(2, 0), Position(3, 0))
+        after = state.snapshot()
+        self.assertIsNot(before.board.rows[2], after.board.rows[2])
+        self.assertIs(before.board.rows[0], after.board.rows[0])
+        self.assertIsNotNone(before.board.piece_at(Position(2, 0)))
+        self.assertIsNone(after.board.piece_at(Position(2, 0)))
+        self.assertEqual(PlayerSide.RED, after.current_player)
+        state.undo(PlayerSide.BLUE)
+        self.assertIs(before.board, state.snapshot().board)
+
+    def test_concurrent_readers_see_consistent_snapshots(self) -> None:
+        state = GameState.new("Blue", "Red")
+        state.undo_remaining = {PlayerSide.BLUE: 10**6, PlayerSide.RED: 10**6}
+        expected = {state.snapshot().version: frozenset(state.board.iter_pieces())}
+        done = threading.Event()
+        failures: list[str] = []
+
+        def writer() -> None:
+            rng = random.Random(11)
+            try:
+                for _ in range(400):
+                    moves = state.legal_moves()
+                    if not moves or rng.random() < 0.2 and state.available_moves():
+                        state.undo(state.current_player)
+                    else:
+                        state.move(*rng.choice(moves))
+                    # Recorded after publication; readers retry unknown versions.
+                    expected[state.snapshot().version] = frozenset(
+                        state.board.iter_pieces())
+            finally:
+                done.set()
+
+        def reader() -> None:
+            while not done.is_set():
+                snap = state.snapshot()
+                pieces = frozenset(snap.board.iter_pieces())
+                for piece in pieces:
+                    if snap.board.piece_at(piece.position) is not piece:
+                        failures.append(f"misplaced piece in v{snap.version}")
+                parity = PlayerSide.BLUE if snap.move_count % 2 == 0 else PlayerSide.RED
+                if snap.current_player is not parity:
+                    failures.append(f"turn/move count mismatch in v{snap.version}")
+                if snap.version in expected and expected[snap.version] != pieces:
+                    failures.append(f"board mismatch in v{snap.version}")
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], failures[:5])
+
+
+class EventStreamTest(unittest.TestCase):
+    def test_events_carry_square_diffs(self) -> None:
+        board = Board()
+        board._place_piece(Piece(PieceType.DOG, PlayerSide.BLUE, Position(7, 2)))
+        board._place_piece(Piece(PieceType.CAT, PlayerSide.RED, Position(7, 3)))
+        board._place_piece(Piece(PieceType.RAT, PlayerSide.RED, Position(3, 0)))
+        state = GameState(board=board)
+        observer = state.subscribe()
+        state.rename_player(PlayerSide.RED, "Rex")
+        state.move(Position(7, 2), Position(7, 3))
+        state.move(Position(3, 0), Position(4, 0))
+        state.undo(PlayerSide.RED)
+        rename, applied, _, undone = observer.drain()
+        self.assertEqual(PlayerRenamed(1, PlayerSide.RED, "Rex"), rename)
+        self.assertIsInstance(applied, MoveApplied)
+        self.assertEqual("ca", applied.capture)
+        self.assertEqual((SquareChange("c8", None), SquareChange("d8", "DO")),
+                         applied.changes)
+        self.assertIsInstance(undone, MoveUndone)
+        self.assertEqual((SquareChange("a4", "ra"), SquareChange("a5", None)),
+                         undone.changes)
+
+        state.move(Position(3, 0), Position(4, 0))
+        state.move(Position(7, 3), Position(8, 3))
+        self.assertIsInstance(observer.drain()[-1], WinnerDecided)
+
+    def test_backpressure_policies(self) -> None:
+        state = GameState.new("Blue", "Red")
+        newest = state.subscribe(maxsize=2, policy=BackpressurePolicy.DROP_OLDEST)
+        oldest = state.subscribe(maxsize=2, policy=BackpressurePolicy.DROP_NEWEST)
+        strict = state.subscribe(maxsize=2, policy=BackpressurePolicy.DISCONNECT)
+        for name in ("a", "b", "c"):
+            state.rename_player(PlayerSide.BLUE, name)
+        self.assertEqual(["b", "c"], [e.name for e in newest.drain()])
+        self.assertEqual(["a", "b"], [e.name for e in oldest.drain()])
+        self.assertTrue(strict.closed)
+        self.assertEqual(1, newest.dropped)
+
+    def test_json_lines_adapter(self) -> None:
+        state = GameState.new("Blue", "Red")
+        buffer = io.StringIO()
+        writer = JsonLinesWriter(state.subscribe(), buffer)
+        state.move(Position(2, 0), Position(3, 0))
+        self.assertEqual(1, writer.pump(timeout=0))
+        line = json.loads(buffer.getvalue())
+        self.assertEqual({"type": "move", "seq": 1, "ply": 1, "player": "BLUE",
+                          "piece": "RA", "src": "a3", "dst": "a4", "capture": None,
+                          "changes": [["a3", None], ["a4", "RA"]]}, line)
+
+
+class MoveJournalTest(unittest.TestCase):
+    def test_unwritable_path_raises_journal_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = MoveJournal(Path(tmp) / "missing" / "game.jungle")
+            state = GameState.new()
+            with self.assertRaises(JournalError):
+                journal.attach(state)
+        self.assertIsNone(journal.state)
+
+    def test_resume_replays_tail_and_ignores_torn_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.jungle"
+            state = GameState.new("Alpha", "Beta")
+            journal = MoveJournal(path, fsync=FsyncPolicy.NEVER)
+            journal.attach(state)
+            try:
+                state.move(Position(2, 0), Position(3, 0))
+                state.move(Position(6, 6), Position(5, 6))
+                state.rename_player(PlayerSide.RED, "Gamma")
+                state.undo(PlayerSide.RED)
+                with open(journal.journal_path, "ab") as handle:
+                    handle.write(b'0badc0de {"op":"move","src":"a4"')
+                records, _ = read_journal(journal.journal_path)
+                resumed, seq = resume_game(path)
+            finally:
+                journal.detach()
+        self.assertEqual(4, len(records))
+        self.assertEqual(4, seq)
+        self.assertEqual(state.to_dict(), resumed.to_dict())
+
+    def test_compaction_keeps_undo_history(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.jungle"
+            state = GameState.new("Alpha", "Beta")
+            journal = MoveJournal(path, fsync=FsyncPolicy.BATCH, compact_every=2)
+            journal.attach(state)
+            try:
+                state.move(Position(2, 0), Position(3, 0))
+                state.move(Position(6, 6), Position(5, 6))
+                self.assertEqual([], read_journal(journal.journal_path)[0])
+                state.move(Position(3, 0), Position(4, 0))
+                state.undo(PlayerSide.BLUE)
+                state.undo(PlayerSide.BLUE)
+            finally:
+                journal.detach()
+            resumed, _ = resume_game(path)
+        self.assertEqual(state.to_dict(), resumed.to_dict())
+        self.assertEqual(1, len(resumed.move_log))
+
+    def test_failed_write_detaches_without_undoing_the_move(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.jungle"
+            state = GameState.new("Alpha", "Beta")
+            subscription = state.events.subscribe()
+            journal = MoveJournal(path, fsync=FsyncPolicy.NEVER)
+            journal.attach(state)
+            try:
+                os.close(journal._handle.fileno())
+                state.move(Position(2, 0), Position(3, 0))
+                state.move(Position(6, 6), Position(5, 6))
+            finally:
+                journal.detach()
+        self.assertIsInstance(journal.error, JournalError)
+        self.assertIsNone(journal.state)
+        self.assertEqual(2, len(state.move_log))
+        self.assertIsInstance(subscription.get(), MoveApplied)
+
+    def test_failed_compaction_keeps_journal_writable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.jungle"
+            state = GameState.new("Alpha", "Beta")
+            journal = MoveJournal(path, fsync=FsyncPolicy.NEVER)
+            journal.attach(state)
+            try:
+                path.with_name(path.name + ".tmp").mkdir()
+                with self.assertRaises(JournalError):
+                    journal.compact()
+                state.move(Position(2, 0), Position(3, 0))
+                records, _ = read_journal(journal.journal_path)
+            finally:
+                journal.detach()
+        self.assertIsNone(journal.error)
+        self.assertEqual(["move"], [record["op"] for record in records])
+
+
+class EvaluationTest(unittest.TestCase):
+    def test_incremental_score_matches_full_evaluation(self) -> None:
+        evaluator = Evaluator()
+        state = GameState.new("Blue", "Red")
+        state.undo_remaining = {PlayerSide.BLUE: 100, PlayerSide.RED: 100}
+        state.board.attach_evaluator(evaluator)
+        self.assertEqual(0.0, state.board.evaluation())
+        rng = random.Random(7)
+        for ply in range(80):
+            moves = state.legal_moves()
+            if not moves:
+                break
+            state.move(*rng.choice(moves))
+            if ply % 5 == 4:
+                state.undo(state.current_player)
+            self.assertAlmostEqual(evaluator.evaluate(state.board),
+                                   state.board.evaluation())
+            self.assertAlmostEqual(-state.board.evaluation(PlayerSide.BLUE),
+                                   state.board.evaluation(PlayerSide.RED))
+
+    def test_weights_load_from_config_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "weights.json"
+            EvaluationWeights(material=50.0, mobility=0.0).save(path)
+            evaluator = Evaluator.from_file(path)
+            path.write_text('{"speed": 1}', encoding="utf-8")
+            with self.assertRaises(ValueError):
+                EvaluationWeights.load(path)
+        self.assertEqual(50.0, evaluator.weights.material)
+        self.assertEqual(0.0, evaluator.weights.mobility)
+
 
 if __name__ == "__main__":
     unittest.main()